@@ -1,4 +1,5 @@
 import os
+from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase
 
@@ -36,6 +37,42 @@ async def get_db() -> AsyncSession:
             await session.close()
 
 
+# Statements that bring databases created before the declarative
+# constraints up to date. create_all skips tables that already exist, so
+# constraints and indexes added to the models later never materialize on
+# a deployed database without these. All are idempotent and valid on
+# both SQLite and PostgreSQL.
+#
+# The scrape upsert conflicts on (competitor_id, platform, name), so the
+# unique index is load-bearing: without it every scrape fails with "ON
+# CONFLICT clause does not match any PRIMARY KEY or UNIQUE constraint".
+# Pre-constraint databases may hold duplicates from the old
+# delete-and-reinsert flow, which must go (dependents first) before the
+# index can build.
+_MIGRATION_STATEMENTS = (
+    """DELETE FROM price_history WHERE menu_item_id IN (
+           SELECT id FROM menu_items WHERE id NOT IN (
+               SELECT MIN(id) FROM menu_items
+               GROUP BY competitor_id, platform, name))""",
+    """DELETE FROM alerts WHERE menu_item_id IN (
+           SELECT id FROM menu_items WHERE id NOT IN (
+               SELECT MIN(id) FROM menu_items
+               GROUP BY competitor_id, platform, name))""",
+    """DELETE FROM menu_items WHERE id NOT IN (
+           SELECT MIN(id) FROM menu_items
+           GROUP BY competitor_id, platform, name)""",
+    """CREATE UNIQUE INDEX IF NOT EXISTS uq_menu_item_competitor_platform_name
+           ON menu_items (competitor_id, platform, name)""",
+    # Performance indexes declared on the models: the LOWER(name) join
+    # and the operator category scan run unindexed on pre-existing
+    # databases without these
+    """CREATE INDEX IF NOT EXISTS ix_menu_items_lower_name
+           ON menu_items (LOWER(name))""",
+    """CREATE INDEX IF NOT EXISTS ix_operator_menu_items_operator_category
+           ON operator_menu_items (operator_id, category)""",
+)
+
+
 async def init_db():
     """Initialize database tables."""
     # Import models to register them with Base.metadata
@@ -43,3 +80,5 @@ async def init_db():
 
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+        for statement in _MIGRATION_STATEMENTS:
+            await conn.execute(text(statement))
@@ -1,3 +1,7 @@
+import asyncio
+import logging
+import logging.handlers
+import queue
 from contextlib import asynccontextmanager
 
 from dotenv import load_dotenv
@@ -5,15 +9,33 @@ load_dotenv()  # Load environment variables from .env file
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from sqlalchemy import select
 
 from database import init_db, async_session
 from models import CanonicalCategory
 from routers import competitors_router, dashboard_router, alerts_router, scraping_router, operator_router, categories_router
 from routers.categories import SEED_CATEGORIES
+from services.competitor_scraper import close_scrapers, warmup_login
 from services.scheduler import start_scheduler, stop_scheduler
 
 
+def setup_queue_logging() -> logging.handlers.QueueListener:
+    """
+    Route root-logger records through a queue so log formatting and I/O
+    happen on a background thread instead of blocking the event loop.
+    """
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    root = logging.getLogger()
+    handlers = root.handlers[:] or [logging.StreamHandler()]
+    listener = logging.handlers.QueueListener(
+        log_queue, *handlers, respect_handler_level=True
+    )
+    root.handlers = [logging.handlers.QueueHandler(log_queue)]
+    listener.start()
+    return listener
+
+
 async def auto_seed_categories():
     """Automatically seed canonical categories if none exist."""
     async with async_session() as db:
@@ -36,15 +58,25 @@ async def auto_seed_categories():
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan handler for startup/shutdown events."""
-    # Startup: Initialize database
+    # Startup: Move log I/O off the event loop thread
+    log_listener = setup_queue_logging()
+    # Initialize database
     await init_db()
     # Auto-seed canonical categories (prevents empty DB after redeploy)
     await auto_seed_categories()
     # Start the scheduled scraping service
     await start_scheduler()
+    # Warm up the DoorDash login in the background so the first scrape
+    # doesn't pay for it; scrape-triggered logins wait on the same flow
+    asyncio.create_task(warmup_login())
+    # Pre-build the OpenAPI schema (the one lazily-built schema artifact)
+    # so the first /docs or /openapi.json request doesn't pay for it
+    app.openapi()
     yield
-    # Shutdown: Stop the scheduler
+    # Shutdown: Stop the scheduler and release shared scraper browsers
     await stop_scheduler()
+    await close_scrapers()
+    log_listener.stop()
 
 
 app = FastAPI(
@@ -52,6 +84,7 @@ app = FastAPI(
     description="Backend API for monitoring competitor pricing across delivery platforms",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # Configure CORS to allow requests from the frontend
@@ -3,7 +3,7 @@ from datetime import datetime, timezone
 from decimal import Decimal
 from typing import Optional
 
-from sqlalchemy import ForeignKey, String, Text, Boolean, DateTime, Numeric, UniqueConstraint
+from sqlalchemy import ForeignKey, Index, String, Text, Boolean, DateTime, Numeric, UniqueConstraint, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from database import Base
@@ -81,10 +81,20 @@ class MenuItem(Base):
         back_populates="menu_item", cascade="all, delete-orphan"
     )
 
+    # Unique constraint: one row per competitor + platform + item name,
+    # so scrapes can upsert instead of delete-and-reinsert
+    __table_args__ = (
+        UniqueConstraint('competitor_id', 'platform', 'name', name='uq_menu_item_competitor_platform_name'),
+    )
+
     def __repr__(self) -> str:
         return f"<MenuItem(id={self.id}, name={self.name}, price={self.current_price})>"
 
 
+# Functional index so name matching can happen on LOWER(name) in the database
+Index("ix_menu_items_lower_name", func.lower(MenuItem.name))
+
+
 class PriceHistory(Base):
     __tablename__ = "price_history"
 
@@ -215,6 +225,10 @@ class OperatorMenuItem(Base):
         return f"<OperatorMenuItem(id={self.id}, name={self.name}, price={self.current_price})>"
 
 
+# Covering index so DISTINCT category per operator is an index-only scan
+Index("ix_operator_menu_items_operator_category", OperatorMenuItem.operator_id, OperatorMenuItem.category)
+
+
 class CanonicalCategory(Base):
     """
     Standard category definitions for semantic grouping.
@@ -6,7 +6,9 @@ Provides CRUD endpoints for managing competitor tracking.
 
 from typing import Annotated
 
+import orjson
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
@@ -249,6 +251,55 @@ async def get_competitor_menu(
     return list(result.scalars().all())
 
 
+@router.get("/{competitor_id}/menu/stream")
+async def stream_competitor_menu(
+    competitor_id: str,
+    db: DB,
+    tenant_id: str = Depends(get_tenant_id),
+) -> StreamingResponse:
+    """
+    Stream a competitor's menu items as NDJSON.
+
+    Rows are serialized and sent as they come off the database cursor, so
+    large menus never need the whole response built in memory first.
+    """
+    # Verify competitor exists and belongs to tenant
+    stmt = select(Competitor.id).where(
+        Competitor.id == competitor_id,
+        Competitor.tenant_id == tenant_id,
+    )
+    result = await db.execute(stmt)
+    if result.scalar_one_or_none() is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Competitor with id {competitor_id} not found",
+        )
+
+    items_stmt = select(MenuItem).where(
+        MenuItem.competitor_id == competitor_id
+    ).order_by(MenuItem.category, MenuItem.menu_position)
+
+    async def menu_rows():
+        result = await db.stream(items_stmt)
+        async for item in result.scalars():
+            yield orjson.dumps(
+                {
+                    "id": item.id,
+                    "competitor_id": item.competitor_id,
+                    "platform": item.platform,
+                    "name": item.name,
+                    "category": item.category,
+                    "description": item.description,
+                    "current_price": item.current_price,
+                    "is_available": item.is_available,
+                    "menu_position": item.menu_position,
+                },
+                default=str,
+            ) + b"\n"
+
+    return StreamingResponse(menu_rows(), media_type="application/x-ndjson")
+
+
 @router.get("/{competitor_id}/stats")
 async def get_competitor_stats(
     competitor_id: str,
@@ -9,6 +9,7 @@ from datetime import datetime, timedelta, timezone
 from decimal import Decimal
 from typing import Annotated, Optional
 
+import numpy as np
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -160,7 +161,10 @@ async def get_comparison(
         op_stats = op_items_result.one_or_none()
 
         if op_stats and op_stats.item_count > 0:
-            op_avg = Decimal(str(op_stats.avg_price)) if op_stats.avg_price else Decimal("0.00")
+            # The comparison math runs on float64 arrays; Decimal only
+            # reappears at the schema boundary below
+            op_avg = float(op_stats.avg_price) if op_stats.avg_price else 0.0
+            market_avg = float(market_average)
 
             # Calculate price comparison stats
             # Get all operator items for detailed comparison
@@ -181,42 +185,47 @@ async def get_comparison(
             comp_items_result = await db.execute(comp_items_stmt)
             comp_items = comp_items_result.all()
 
-            from collections import defaultdict
-            comp_prices: dict[str, list] = defaultdict(list)
+            comp_prices: dict[str, list[float]] = defaultdict(list)
             for name, price in comp_items:
-                comp_prices[name.lower()].append(price)
-
-            # Count underpriced, overpriced, competitive
-            underpriced = 0
-            overpriced = 0
-            competitive = 0
-            threshold = Decimal("10.0")  # 10% threshold
+                comp_prices[name.lower()].append(float(price))
 
+            # Pair each operator item with its competitor average
+            matched_prices = []
+            matched_comp_avgs = []
             for op_item in op_items:
-                matching = comp_prices.get(op_item.name.lower(), [])
+                matching = comp_prices.get(op_item.name.lower())
                 if not matching:
                     continue
+                matched_prices.append(float(op_item.current_price))
+                matched_comp_avgs.append(sum(matching) / len(matching))
 
-                comp_avg = sum(matching) / len(matching)
-                pct_diff = ((op_item.current_price - comp_avg) / comp_avg * 100) if comp_avg > 0 else Decimal("0.00")
-
-                if pct_diff < -threshold:
-                    underpriced += 1
-                elif pct_diff > threshold:
-                    overpriced += 1
-                else:
-                    competitive += 1
+            # Count underpriced, overpriced, competitive (10% threshold)
+            underpriced = 0
+            overpriced = 0
+            competitive = 0
+            if matched_prices:
+                op_arr = np.asarray(matched_prices, dtype=np.float64)
+                comp_arr = np.asarray(matched_comp_avgs, dtype=np.float64)
+                pct_diffs = np.divide(
+                    (op_arr - comp_arr) * 100,
+                    comp_arr,
+                    out=np.zeros_like(op_arr),
+                    where=comp_arr > 0,
+                )
+                underpriced = int((pct_diffs < -10.0).sum())
+                overpriced = int((pct_diffs > 10.0).sum())
+                competitive = len(matched_prices) - underpriced - overpriced
 
             # Calculate overall difference
-            price_diff = op_avg - market_average
-            pct_diff = ((price_diff / market_average) * 100) if market_average > 0 else Decimal("0.00")
+            price_diff = op_avg - market_avg
+            pct_diff = (price_diff / market_avg * 100) if market_avg > 0 else 0.0
 
             operator_comparison = OperatorComparison(
                 operator_name=op_profile.restaurant_name,
-                operator_avg_price=round(op_avg, 2),
-                market_avg_price=round(market_average, 2),
-                price_difference=round(price_diff, 2),
-                percentage_difference=round(pct_diff, 2),
+                operator_avg_price=Decimal(f"{op_avg:.2f}"),
+                market_avg_price=Decimal(f"{market_avg:.2f}"),
+                price_difference=Decimal(f"{price_diff:.2f}"),
+                percentage_difference=Decimal(f"{pct_diff:.2f}"),
                 underpriced_items=underpriced,
                 overpriced_items=overpriced,
                 competitive_items=competitive,
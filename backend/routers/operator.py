@@ -6,7 +6,6 @@ menu scraping, and price comparison analysis.
 """
 
 import asyncio
-from collections import defaultdict
 from datetime import datetime, timezone
 from decimal import Decimal
 from typing import Annotated, Optional
@@ -14,10 +13,11 @@ from typing import Annotated, Optional
 from fastapi import APIRouter, Depends, HTTPException, Query, Header
 from sqlalchemy import select, func, delete
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import load_only, selectinload
 
 from database import get_db
 from models import OperatorProfile, OperatorMenuItem, Competitor, MenuItem
+from services.analysis_cache import price_analysis_cache
 from tenant import get_tenant_id
 from schemas import (
     OperatorProfileCreate,
@@ -25,6 +25,7 @@ from schemas import (
     OperatorProfileRead,
     OperatorProfileWithItems,
     OperatorMenuItemRead,
+    OperatorMenuItemReadList,
     PriceGap,
     PriceAnalysisResponse,
     ROIAnalysis,
@@ -34,6 +35,11 @@ router = APIRouter(prefix="/operator", tags=["operator"])
 
 DB = Annotated[AsyncSession, Depends(get_db)]
 
+# Reused Decimal constants for the ROI math
+_CENT = Decimal("0.01")
+_D100 = Decimal(100)
+_D12 = Decimal(12)
+
 
 # =============================================================================
 # Operator Profile CRUD
@@ -284,7 +290,7 @@ async def get_operator_menu(
     items_result = await db.execute(items_stmt)
     items = items_result.scalars().all()
 
-    return [OperatorMenuItemRead.model_validate(item) for item in items]
+    return OperatorMenuItemReadList.validate_python(items)
 
 
 # =============================================================================
@@ -302,9 +308,22 @@ async def get_price_analysis(
 
     Returns price gaps and opportunities for optimization.
     """
-    # Get operator profile and menu
+    # Menu data only changes when a scrape lands, so serve repeated requests
+    # from the in-process cache keyed on the latest scrape timestamp
+    data_version = await db.scalar(
+        select(func.max(Competitor.last_scraped_at)).where(Competitor.tenant_id == tenant_id)
+    )
+    cache_key = (tenant_id, threshold, data_version)
+    cached = await price_analysis_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    # Get operator profile and menu; the analysis only needs name and price,
+    # so skip hydrating heavy columns like description
     profile_stmt = select(OperatorProfile).options(
-        selectinload(OperatorProfile.menu_items)
+        selectinload(OperatorProfile.menu_items).load_only(
+            OperatorMenuItem.name, OperatorMenuItem.current_price
+        )
     ).where(OperatorProfile.tenant_id == tenant_id).limit(1)
     profile_result = await db.execute(profile_stmt)
     profile = profile_result.scalar_one_or_none()
@@ -315,47 +334,43 @@ async def get_price_analysis(
             detail="No operator menu items found. Please add your restaurant and scrape your menu first.",
         )
 
-    # Get all competitor menu items (filtered by tenant)
-    competitor_items_stmt = select(MenuItem, Competitor.name.label("competitor_name")).join(
+    # Match operator items to competitor items in a single SQL-side join on
+    # LOWER(name), aggregated per operator item. The database does the hash
+    # join and averaging; Python only sees already-matched rows.
+    matches_stmt = select(
+        OperatorMenuItem.name,
+        OperatorMenuItem.current_price,
+        func.avg(MenuItem.current_price).label("competitor_avg"),
+        func.count(MenuItem.id).label("match_count"),
+    ).select_from(OperatorMenuItem).join(
+        MenuItem, func.lower(MenuItem.name) == func.lower(OperatorMenuItem.name)
+    ).join(
         Competitor, MenuItem.competitor_id == Competitor.id
     ).where(
+        OperatorMenuItem.operator_id == profile.id,
         Competitor.scraping_enabled == True,  # noqa: E712
         Competitor.tenant_id == tenant_id,
-    )
+    ).group_by(OperatorMenuItem.id)
 
-    competitor_result = await db.execute(competitor_items_stmt)
-    competitor_items = competitor_result.all()
+    matches_result = await db.execute(matches_stmt)
 
-    # Build competitor price map by item name (lowercase for matching)
-    competitor_prices: dict[str, list[tuple[Decimal, str]]] = defaultdict(list)
-    for item, comp_name in competitor_items:
-        competitor_prices[item.name.lower()].append((item.current_price, comp_name))
-
-    # Analyze each operator item
-    price_gaps = []
+    # Analyze each matched operator item; keep the numeric loop free of
+    # Pydantic work and collect plain tuples instead
+    gap_rows: list[tuple] = []
     underpriced_count = 0
     overpriced_count = 0
     competitive_count = 0
     total_potential_increase = Decimal("0.00")
-    operator_prices = []
-    market_prices = []
-
-    for op_item in profile.menu_items:
-        item_name_lower = op_item.name.lower()
-        operator_prices.append(op_item.current_price)
-
-        # Find matching competitor items
-        matching = competitor_prices.get(item_name_lower, [])
-
-        if not matching:
-            continue
+    market_price_sum = Decimal("0.00")
+    market_price_count = 0
 
-        # Calculate competitor average
-        comp_avg = sum(p for p, _ in matching) / len(matching)
-        market_prices.extend(p for p, _ in matching)
+    for row in matches_result:
+        comp_avg = Decimal(str(row.competitor_avg))
+        market_price_sum += comp_avg * row.match_count
+        market_price_count += row.match_count
 
         # Calculate difference
-        diff = op_item.current_price - comp_avg
+        diff = row.current_price - comp_avg
         pct_diff = (diff / comp_avg * 100) if comp_avg > 0 else Decimal("0.00")
 
         # Determine opportunity type
@@ -370,24 +385,30 @@ async def get_price_analysis(
             opportunity_type = "competitive"
             competitive_count += 1
 
-        price_gaps.append(PriceGap(
-            operator_item_name=op_item.name,
-            operator_price=op_item.current_price,
+        gap_rows.append((row.name, row.current_price, comp_avg, diff, pct_diff, opportunity_type, row.match_count))
+
+    # Sort by percentage difference (most underpriced first), then build the
+    # response objects in one pass. Every field is server-computed, so
+    # model_construct safely skips validation.
+    gap_rows.sort(key=lambda r: r[4])
+    price_gaps = [
+        PriceGap.model_construct(
+            operator_item_name=name,
+            operator_price=op_price,
             competitor_avg_price=round(comp_avg, 2),
             price_difference=round(diff, 2),
             percentage_difference=round(pct_diff, 2),
             opportunity_type=opportunity_type,
-            matching_competitors=len(matching),
-        ))
-
-    # Sort by percentage difference (most underpriced first)
-    price_gaps.sort(key=lambda x: x.percentage_difference)
+            matching_competitors=match_count,
+        )
+        for name, op_price, comp_avg, diff, pct_diff, opportunity_type, match_count in gap_rows
+    ]
 
-    # Calculate averages
-    operator_avg = sum(operator_prices) / len(operator_prices) if operator_prices else Decimal("0.00")
-    market_avg = sum(market_prices) / len(market_prices) if market_prices else Decimal("0.00")
+    # Calculate averages (operator average covers the whole menu, matched or not)
+    operator_avg = sum(item.current_price for item in profile.menu_items) / len(profile.menu_items)
+    market_avg = market_price_sum / market_price_count if market_price_count else Decimal("0.00")
 
-    return PriceAnalysisResponse(
+    response = PriceAnalysisResponse(
         operator_avg_price=round(operator_avg, 2),
         market_avg_price=round(market_avg, 2),
         total_items_compared=len(price_gaps),
@@ -397,6 +418,8 @@ async def get_price_analysis(
         potential_revenue_increase=round(total_potential_increase, 2),
         price_gaps=price_gaps,
     )
+    await price_analysis_cache.set(cache_key, response)
+    return response
 
 
 @router.get("/roi-analysis", response_model=ROIAnalysis)
@@ -413,9 +436,11 @@ async def get_roi_analysis(
 
     Uses operator profile values as defaults, but can be overridden with query params.
     """
-    # Get operator profile
+    # Get operator profile; the menu items are only checked for existence here
     profile_stmt = select(OperatorProfile).options(
-        selectinload(OperatorProfile.menu_items)
+        selectinload(OperatorProfile.menu_items).load_only(
+            OperatorMenuItem.name, OperatorMenuItem.current_price
+        )
     ).where(OperatorProfile.tenant_id == tenant_id).limit(1)
     profile_result = await db.execute(profile_stmt)
     profile = profile_result.scalar_one_or_none()
@@ -454,12 +479,19 @@ async def get_roi_analysis(
         try:
             analysis = await get_price_analysis(db, tenant_id, threshold=10.0)
             underpriced_count = analysis.underpriced_items
-            top_opportunities = [g for g in analysis.price_gaps if g.opportunity_type == "underpriced"][:5]
 
-            # Calculate average underpricing
-            underpriced_gaps = [g for g in analysis.price_gaps if g.opportunity_type == "underpriced"]
-            if underpriced_gaps:
-                avg_underpricing_pct = abs(sum(g.percentage_difference for g in underpriced_gaps) / len(underpriced_gaps))
+            # Single pass: price_gaps is sorted most-underpriced first, so the
+            # first five underpriced gaps encountered are the top opportunities
+            underpricing_sum = Decimal("0.00")
+            underpricing_count = 0
+            for gap in analysis.price_gaps:
+                if gap.opportunity_type == "underpriced":
+                    underpricing_sum += gap.percentage_difference
+                    underpricing_count += 1
+                    if len(top_opportunities) < 5:
+                        top_opportunities.append(gap)
+            if underpricing_count:
+                avg_underpricing_pct = abs(underpricing_sum / underpricing_count)
         except HTTPException:
             pass  # No menu items yet
 
@@ -467,29 +499,37 @@ async def get_roi_analysis(
     # Use the average underpricing percentage, capped at 10%
     potential_increase_pct = min(float(avg_underpricing_pct), 10.0) if avg_underpricing_pct > 0 else 3.0
 
-    # Calculate ROI
-    current_revenue = Decimal(str(orders)) * Decimal(str(aov))
-    new_aov = Decimal(str(aov)) * (1 + Decimal(str(potential_increase_pct)) / 100)
-    new_revenue = Decimal(str(orders)) * new_aov
+    # Calculate ROI. Convert each input to Decimal once (int path for orders,
+    # a single quantize for the bounded floats) instead of repeated
+    # Decimal(str(...)) round-trips.
+    orders_d = Decimal(orders)
+    aov_d = Decimal(aov).quantize(_CENT)
+    margin_d = Decimal(margin).quantize(_CENT)
+    increase_pct_d = Decimal(potential_increase_pct).quantize(_CENT)
+    forkast_monthly_d = Decimal(forkast_monthly_cost).quantize(_CENT)
+
+    current_revenue = orders_d * aov_d
+    new_aov = aov_d * (1 + increase_pct_d / _D100)
+    new_revenue = orders_d * new_aov
     additional_revenue = new_revenue - current_revenue
-    additional_profit = additional_revenue * (Decimal(str(margin)) / 100)
-    annual_impact = additional_profit * 12
+    additional_profit = additional_revenue * (margin_d / _D100)
+    annual_impact = additional_profit * _D12
 
     # Forkast ROI
-    forkast_annual = Decimal(str(forkast_monthly_cost)) * 12
+    forkast_annual = forkast_monthly_d * _D12
     net_roi = annual_impact - forkast_annual
     roi_multiple = annual_impact / forkast_annual if forkast_annual > 0 else Decimal("0.00")
 
     return ROIAnalysis(
         monthly_orders=orders,
-        average_order_value=Decimal(str(aov)),
-        profit_margin=Decimal(str(margin)),
+        average_order_value=aov_d,
+        profit_margin=margin_d,
         current_monthly_revenue=round(current_revenue, 2),
-        potential_price_increase_pct=round(Decimal(str(potential_increase_pct)), 2),
+        potential_price_increase_pct=increase_pct_d,
         additional_monthly_revenue=round(additional_revenue, 2),
         additional_monthly_profit=round(additional_profit, 2),
         annual_impact=round(annual_impact, 2),
-        forkast_monthly_cost=Decimal(str(forkast_monthly_cost)),
+        forkast_monthly_cost=forkast_monthly_d,
         forkast_annual_cost=round(forkast_annual, 2),
         net_annual_roi=round(net_roi, 2),
         roi_multiple=round(roi_multiple, 2),
@@ -505,17 +545,12 @@ async def get_operator_categories(
     tenant_id: str = Depends(get_tenant_id),
 ) -> list[str]:
     """Get list of unique categories from operator's menu."""
-    stmt = select(OperatorProfile).where(
-        OperatorProfile.tenant_id == tenant_id
-    ).limit(1)
-    result = await db.execute(stmt)
-    profile = result.scalar_one_or_none()
-
-    if not profile:
-        return []
-
-    cat_stmt = select(OperatorMenuItem.category).distinct().where(
-        OperatorMenuItem.operator_id == profile.id,
+    # Single round trip: join through the profile instead of fetching it first.
+    # The (operator_id, category) index covers the scan.
+    cat_stmt = select(OperatorMenuItem.category).distinct().join(
+        OperatorProfile, OperatorMenuItem.operator_id == OperatorProfile.id
+    ).where(
+        OperatorProfile.tenant_id == tenant_id,
         OperatorMenuItem.category.isnot(None),
     ).order_by(OperatorMenuItem.category)
 
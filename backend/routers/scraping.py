@@ -4,18 +4,21 @@ Scraping API router.
 Provides endpoint to trigger menu scraping for competitors with mock fallback.
 """
 
-import random
-from datetime import datetime, timezone
+import asyncio
+import functools
+import re
 from decimal import Decimal
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import select, delete
+import numpy as np
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only
 
 from database import get_db
-from models import Competitor, MenuItem, PriceHistory
-from services.category_ai import category_ai_service
+from models import Competitor, MenuItem
 from tenant import get_tenant_id
 
 router = APIRouter(prefix="/scraping", tags=["scraping"])
@@ -109,57 +112,111 @@ MOCK_MEXICAN_ITEMS = {
 }
 
 
-def get_mock_menu_for_concept(concept_type: str | None) -> dict:
-    """Get appropriate mock menu based on concept type."""
+def _flatten_menu(menu: dict) -> tuple[tuple, np.ndarray]:
+    """
+    Flatten a nested mock menu into (category, name, description) rows plus
+    a parallel array of base prices pre-parsed into integer cents.
+    """
+    rows = tuple(
+        (category, item["name"], item["description"])
+        for category, category_items in menu.items()
+        for item in category_items
+    )
+    base_cents = np.array(
+        [
+            int(Decimal(item["price"]).scaleb(2))
+            for category_items in menu.values()
+            for item in category_items
+        ],
+        dtype=np.int64,
+    )
+    return rows, base_cents
+
+
+# Flattened once at import so generate_mock_items is a single sequential
+# scan over pre-parsed rows instead of nested dict iteration and Decimal
+# parsing on every call
+_FLAT_BURGER_MENU = _flatten_menu(MOCK_MENU_ITEMS)
+_FLAT_PIZZA_MENU = _flatten_menu(MOCK_PIZZA_ITEMS)
+_FLAT_MEXICAN_MENU = _flatten_menu(MOCK_MEXICAN_ITEMS)
+
+
+# Precompiled token -> menu dispatch so concept matching is a dict lookup
+# per word instead of repeated substring scans
+_CONCEPT_TOKEN_RE = re.compile(r"\w+")
+_CONCEPT_MENUS = {
+    "pizza": _FLAT_PIZZA_MENU,
+    "pizzas": _FLAT_PIZZA_MENU,
+    "italian": _FLAT_PIZZA_MENU,
+    "mexican": _FLAT_MEXICAN_MENU,
+    "taco": _FLAT_MEXICAN_MENU,
+    "tacos": _FLAT_MEXICAN_MENU,
+}
+
+
+# One RNG shared across calls; numpy lets us draw all jitters in one call
+_rng = np.random.default_rng()
+
+
+@functools.lru_cache(maxsize=32)
+def get_mock_menu_for_concept(concept_type: str | None) -> tuple[tuple, np.ndarray]:
+    """
+    Get the appropriate flattened mock menu based on concept type.
+
+    Memoized per concept string: repeated fallbacks for the same concept
+    (e.g. many competitors of one type in a scheduled run) skip the
+    tokenize-and-match step entirely.
+    """
     if concept_type:
-        concept_lower = concept_type.lower()
-        if "pizza" in concept_lower or "italian" in concept_lower:
-            return MOCK_PIZZA_ITEMS
-        elif "mexican" in concept_lower or "taco" in concept_lower:
-            return MOCK_MEXICAN_ITEMS
-    return MOCK_MENU_ITEMS
+        for token in _CONCEPT_TOKEN_RE.findall(concept_type.casefold()):
+            menu = _CONCEPT_MENUS.get(token)
+            if menu is not None:
+                return menu
+    return _FLAT_BURGER_MENU
 
 
 def generate_mock_items(concept_type: str | None) -> list[dict]:
     """Generate mock menu items with slight price variations."""
-    menu_data = get_mock_menu_for_concept(concept_type)
-    items = []
-    position = 0
-
-    for category, category_items in menu_data.items():
-        for item in category_items:
-            # Add slight random price variation (-10% to +15%)
-            base_price = Decimal(item["price"])
-            variation = Decimal(str(random.uniform(0.90, 1.15)))
-            final_price = (base_price * variation).quantize(Decimal("0.01"))
-
-            items.append({
-                "name": item["name"],
-                "category": category,
-                "description": item["description"],
-                "price": final_price,
-                "position": position,
-            })
-            position += 1
-
-    return items
-
-
-@router.post("/trigger/{competitor_id}")
+    rows, base_cents = get_mock_menu_for_concept(concept_type)
+
+    # Add slight random price variation (-10% to +15%) in basis points,
+    # drawn and applied for the whole menu in one vectorized pass
+    jitters = _rng.integers(9000, 11501, size=len(rows))
+    cents = base_cents * jitters // 10000
+
+    return [
+        {
+            "name": name,
+            "category": category,
+            "description": description,
+            "price": Decimal(int(item_cents)).scaleb(-2),
+            "position": position,
+        }
+        for position, ((category, name, description), item_cents)
+        in enumerate(zip(rows, cents))
+    ]
+
+
+@router.post("/trigger/{competitor_id}", status_code=status.HTTP_202_ACCEPTED)
 async def trigger_scrape(
     competitor_id: str,
     db: DB,
     tenant_id: str = Depends(get_tenant_id),
 ) -> dict:
     """
-    Trigger a menu scrape for a competitor.
+    Queue a background menu scrape for a competitor.
 
-    Tries Uber Eats first (most reliable), then DoorDash.
+    Tries Uber Eats first (most reliable), then DoorDash. Returns a job_id
+    immediately; poll /scraping/jobs/{job_id} for progress.
     """
-    # Fetch competitor (filtered by tenant)
-    stmt = select(Competitor).where(
-        Competitor.id == competitor_id,
-        Competitor.tenant_id == tenant_id,
+    # Fetch competitor (filtered by tenant); only the columns we read
+    stmt = (
+        select(Competitor)
+        .options(load_only(Competitor.name, Competitor.ubereats_url, Competitor.doordash_url))
+        .where(
+            Competitor.id == competitor_id,
+            Competitor.tenant_id == tenant_id,
+        )
     )
     result = await db.execute(stmt)
     competitor = result.scalar_one_or_none()
@@ -169,148 +226,134 @@ async def trigger_scrape(
             detail=f"Competitor with id {competitor_id} not found",
         )
 
-    items_data = []
-    scrape_source = None
-
-    # Try Uber Eats first (more reliable, no login required)
-    if competitor.ubereats_url and not items_data:
-        try:
-            from scraper.ubereats_scraper import UberEatsScraper
-
-            print(f"Scraping Uber Eats for {competitor.name}...")
-            scraper = UberEatsScraper()
-            result = await scraper.scrape(competitor.ubereats_url)
-            await scraper.close()
-
-            if result.success and result.items:
-                items_data = [
-                    {
-                        "name": item.name,
-                        "category": item.category,
-                        "description": item.description,
-                        "price": item.price,
-                        "position": item.position,
-                    }
-                    for item in result.items
-                ]
-                scrape_source = "ubereats"
-                print(f"Successfully scraped {len(items_data)} items from Uber Eats")
-        except Exception as e:
-            print(f"Uber Eats scraper error for {competitor.name}: {e}")
-
-    # Try DoorDash as fallback
-    if competitor.doordash_url and not items_data:
-        try:
-            from scraper.doordash_scraper import DoorDashScraper
-
-            print(f"Scraping DoorDash for {competitor.name}...")
-            scraper = DoorDashScraper()
-            result = await scraper.scrape(competitor.doordash_url)
-            await scraper.close()
-
-            if result.success and result.items:
-                items_data = [
-                    {
-                        "name": item.name,
-                        "category": item.category,
-                        "description": item.description,
-                        "price": item.price,
-                        "position": item.position,
-                    }
-                    for item in result.items
-                ]
-                scrape_source = "doordash"
-                print(f"Successfully scraped {len(items_data)} items from DoorDash")
-        except Exception as e:
-            print(f"DoorDash scraper error for {competitor.name}: {e}")
-
-    # If no data scraped, return error
-    if not items_data:
+    if not competitor.ubereats_url and not competitor.doordash_url:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Could not scrape menu for {competitor.name}. Please check the URLs are valid.",
+            detail=f"No delivery platform URLs configured for {competitor.name}.",
         )
 
-    # Clear existing menu items for this competitor
-    await db.execute(
-        delete(MenuItem).where(MenuItem.competitor_id == competitor_id)
+    # Import here to avoid circular imports
+    from services.competitor_scraper import scrape_competitor_menu_task
+    from services.scrape_status import scrape_tracker
+
+    # Create a job for tracking
+    job = await scrape_tracker.create_job(
+        source_type="competitor",
+        source_id=competitor_id,
+        platform="ubereats" if competitor.ubereats_url else "doordash",
+        url=competitor.ubereats_url or competitor.doordash_url,
     )
 
-    # Save new menu items
-    new_items = []
-    for item_data in items_data:
-        menu_item = MenuItem(
-            competitor_id=competitor_id,
-            platform=scrape_source,
-            name=item_data["name"],
-            category=item_data.get("category"),
-            description=item_data.get("description"),
-            current_price=item_data["price"],
-            is_available=True,
-            menu_position=item_data.get("position"),
-        )
-        db.add(menu_item)
-        new_items.append(menu_item)
-
-    # Flush to get IDs for price history
-    await db.flush()
-
-    # Record price history for each item
-    for menu_item in new_items:
-        price_record = PriceHistory(
-            menu_item_id=menu_item.id,
-            price=menu_item.current_price,
-            recorded_at=datetime.now(timezone.utc),
+    # Run scraping in background so the request worker is freed immediately
+    asyncio.create_task(scrape_competitor_menu_task(competitor_id, job.job_id, tenant_id))
+
+    return {
+        "status": "started",
+        "competitor_id": competitor_id,
+        "competitor_name": competitor.name,
+        "job_id": job.job_id,
+        "message": f"Scraping menu for {competitor.name} in background",
+    }
+
+
+@router.post("/trigger-all", status_code=status.HTTP_202_ACCEPTED)
+async def trigger_scrape_all(
+    db: DB,
+    tenant_id: str = Depends(get_tenant_id),
+) -> dict:
+    """
+    Queue background scrapes for every enabled competitor.
+
+    Scrapes run concurrently with bounded concurrency; one tracked job is
+    created per competitor so progress can be polled individually.
+    """
+    stmt = (
+        select(Competitor)
+        .options(load_only(Competitor.ubereats_url, Competitor.doordash_url))
+        .where(
+            Competitor.scraping_enabled == True,  # noqa: E712
+            Competitor.tenant_id == tenant_id,
         )
-        db.add(price_record)
+    )
+    result = await db.execute(stmt)
+    competitors = [
+        c for c in result.scalars().all()
+        if c.ubereats_url or c.doordash_url
+    ]
 
-    # Update competitor's last_scraped_at
-    competitor.last_scraped_at = datetime.now(timezone.utc)
+    if not competitors:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No enabled competitors with delivery platform URLs to scrape.",
+        )
 
-    await db.commit()
+    # Import here to avoid circular imports
+    from services.competitor_scraper import scrape_all_competitors_task
+    from services.scrape_status import scrape_tracker
+
+    jobs = []
+    for competitor in competitors:
+        job = await scrape_tracker.create_job(
+            source_type="competitor",
+            source_id=competitor.id,
+            platform="ubereats" if competitor.ubereats_url else "doordash",
+            url=competitor.ubereats_url or competitor.doordash_url,
+        )
+        jobs.append((competitor.id, job.job_id))
 
-    # Auto-map categories for the competitor
-    categories_mapped = 0
-    try:
-        raw_categories = list(set(
-            item_data.get("category") for item_data in items_data
-            if item_data.get("category")
-        ))
-        if raw_categories:
-            unmapped = await category_ai_service.get_unmapped_categories(
-                db, "competitor", competitor_id, raw_categories, tenant_id
-            )
-            if unmapped:
-                mapped = await category_ai_service.auto_map_categories(
-                    db, "competitor", competitor_id, unmapped, threshold=0.35, tenant_id=tenant_id
-                )
-                categories_mapped = len(mapped)
-                print(f"Auto-mapped {categories_mapped} categories for competitor {competitor.name}")
-    except Exception as e:
-        print(f"Category auto-mapping error (non-fatal): {e}")
+    asyncio.create_task(scrape_all_competitors_task(jobs, tenant_id))
 
     return {
-        "success": True,
-        "competitor_id": competitor_id,
-        "competitor_name": competitor.name,
-        "items_count": len(new_items),
-        "source": scrape_source,
-        "categories_mapped": categories_mapped,
-        "message": f"Successfully scraped {len(new_items)} menu items from {scrape_source}",
+        "status": "started",
+        "competitors_queued": len(jobs),
+        "job_ids": [job_id for _, job_id in jobs],
+        "message": f"Scraping {len(jobs)} competitors in background",
     }
 
 
-@router.get("/status/{competitor_id}")
+@router.get("/jobs/{job_id}")
+async def get_scrape_job(job_id: str) -> dict:
+    """Get the status of a background scrape job."""
+    from services.scrape_status import scrape_tracker
+
+    job = await scrape_tracker.get_job(job_id)
+
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Scrape job not found",
+        )
+
+    return job.to_dict()
+
+
+@router.get("/status/{competitor_id}", response_model=None)
 async def get_scrape_status(
     competitor_id: str,
+    request: Request,
+    response: Response,
     db: DB,
     tenant_id: str = Depends(get_tenant_id),
-) -> dict:
-    """Get scraping status and item count for a competitor."""
-    # Fetch competitor (filtered by tenant)
-    stmt = select(Competitor).where(
-        Competitor.id == competitor_id,
-        Competitor.tenant_id == tenant_id,
+) -> dict | Response:
+    """
+    Get scraping status and item count for a competitor.
+
+    The response carries an ETag derived from last_scraped_at and the
+    item count so the frontend's polling gets 304s between scrapes.
+    """
+    # Fetch competitor (filtered by tenant); only the columns we read
+    stmt = (
+        select(Competitor)
+        .options(load_only(
+            Competitor.name,
+            Competitor.last_scraped_at,
+            Competitor.ubereats_url,
+            Competitor.doordash_url,
+        ))
+        .where(
+            Competitor.id == competitor_id,
+            Competitor.tenant_id == tenant_id,
+        )
     )
     result = await db.execute(stmt)
     competitor = result.scalar_one_or_none()
@@ -320,15 +363,25 @@ async def get_scrape_status(
             detail=f"Competitor with id {competitor_id} not found",
         )
 
-    # Count menu items
-    stmt = select(MenuItem).where(MenuItem.competitor_id == competitor_id)
-    result = await db.execute(stmt)
-    items = result.scalars().all()
+    # Count menu items in the database instead of materializing every row
+    items_count = await db.scalar(
+        select(func.count())
+        .select_from(MenuItem)
+        .where(MenuItem.competitor_id == competitor_id)
+    )
+
+    scraped_ts = int(competitor.last_scraped_at.timestamp()) if competitor.last_scraped_at else 0
+    etag = f'W/"{scraped_ts}-{items_count}"'
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED)
+
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "public, max-age=30"
 
     return {
         "competitor_id": competitor_id,
         "competitor_name": competitor.name,
-        "items_count": len(items),
+        "items_count": items_count,
         "last_scraped_at": competitor.last_scraped_at,
         "has_doordash_url": bool(competitor.doordash_url),
         "has_ubereats_url": bool(competitor.ubereats_url),
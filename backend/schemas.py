@@ -2,14 +2,14 @@
 Pydantic V2 schemas for the Competitive Intelligence Dashboard API.
 
 These schemas handle request/response serialization and validation.
-Uses ConfigDict(from_attributes=True) for ORM compatibility.
+Uses ConfigDict(from_attributes=True, defer_build=True) for ORM compatibility.
 """
 
 from datetime import datetime
 from decimal import Decimal
 from typing import Optional
 
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
 
 
 # =============================================================================
@@ -43,7 +43,7 @@ class CompetitorUpdate(BaseModel):
 
 class CompetitorRead(CompetitorBase):
     """Schema for reading competitor data."""
-    model_config = ConfigDict(from_attributes=True)
+    model_config = ConfigDict(from_attributes=True, defer_build=True)
 
     id: str
     last_scraped_at: Optional[datetime] = None
@@ -57,7 +57,7 @@ class CompetitorRead(CompetitorBase):
 
 class PriceHistoryRead(BaseModel):
     """Schema for reading price history data."""
-    model_config = ConfigDict(from_attributes=True)
+    model_config = ConfigDict(from_attributes=True, defer_build=True)
 
     id: str
     price: Decimal
@@ -87,7 +87,7 @@ class MenuItemCreate(MenuItemBase):
 
 class MenuItemSimple(MenuItemBase):
     """Schema for reading menu item data without price history."""
-    model_config = ConfigDict(from_attributes=True)
+    model_config = ConfigDict(from_attributes=True, defer_build=True)
 
     id: str
     competitor_id: str
@@ -112,7 +112,7 @@ class MenuItemWithCompetitor(MenuItemSimple):
 
 class AlertRead(BaseModel):
     """Schema for reading alert data."""
-    model_config = ConfigDict(from_attributes=True)
+    model_config = ConfigDict(from_attributes=True, defer_build=True)
 
     id: str
     menu_item_id: str
@@ -173,6 +173,7 @@ class OperatorComparison(BaseModel):
 
 class DashboardComparison(BaseModel):
     """Main dashboard comparison view."""
+    model_config = ConfigDict(defer_build=True)
     market_average: Decimal
     total_items_tracked: int
     total_competitors: int
@@ -184,7 +185,7 @@ class DashboardComparison(BaseModel):
 
 class CompetitorMenuItem(BaseModel):
     """Menu item for comparison grid."""
-    model_config = ConfigDict(from_attributes=True)
+    model_config = ConfigDict(from_attributes=True, defer_build=True)
 
     id: str
     name: str
@@ -196,6 +197,7 @@ class CompetitorMenuItem(BaseModel):
 
 class ItemComparison(BaseModel):
     """Comparison of a single item across competitors."""
+    model_config = ConfigDict(defer_build=True)
     item_name: str
     category: Optional[str]
     market_avg: Decimal
@@ -217,6 +219,7 @@ class PaginatedResponse(BaseModel):
 
 class AlertsResponse(BaseModel):
     """Response for alerts endpoint."""
+    model_config = ConfigDict(defer_build=True)
     alerts: list[AlertWithItem]
     unacknowledged_count: int
     total_count: int
@@ -243,6 +246,7 @@ class ItemPriceHistory(BaseModel):
 
 class PriceHistoryResponse(BaseModel):
     """Response for price history chart endpoint."""
+    model_config = ConfigDict(defer_build=True)
     items: list[ItemPriceHistory]
     start_date: str
     end_date: str
@@ -283,7 +287,7 @@ class OperatorProfileUpdate(BaseModel):
 
 class OperatorProfileRead(OperatorProfileBase):
     """Schema for reading operator profile."""
-    model_config = ConfigDict(from_attributes=True)
+    model_config = ConfigDict(from_attributes=True, defer_build=True)
 
     id: str
     last_scraped_at: Optional[datetime] = None
@@ -293,7 +297,7 @@ class OperatorProfileRead(OperatorProfileBase):
 
 class OperatorMenuItemRead(BaseModel):
     """Schema for reading operator menu item."""
-    model_config = ConfigDict(from_attributes=True)
+    model_config = ConfigDict(from_attributes=True, defer_build=True)
 
     id: str
     platform: str
@@ -312,6 +316,11 @@ class OperatorProfileWithItems(OperatorProfileRead):
     menu_items: list[OperatorMenuItemRead] = []
 
 
+# Pre-built list adapter: validates a whole ORM result in one pydantic-core
+# call instead of a per-element model_validate loop
+OperatorMenuItemReadList = TypeAdapter(list[OperatorMenuItemRead])
+
+
 # =============================================================================
 # Price Comparison Schemas (Operator vs Competitors)
 # =============================================================================
@@ -329,6 +338,7 @@ class PriceGap(BaseModel):
 
 class PriceAnalysisResponse(BaseModel):
     """Response for price analysis endpoint."""
+    model_config = ConfigDict(defer_build=True)
     operator_avg_price: Decimal
     market_avg_price: Decimal
     total_items_compared: int
@@ -345,6 +355,7 @@ class PriceAnalysisResponse(BaseModel):
 
 class ROIAnalysis(BaseModel):
     """Enhanced ROI analysis with real data."""
+    model_config = ConfigDict(defer_build=True)
     # Business inputs
     monthly_orders: int
     average_order_value: Decimal
@@ -387,7 +398,7 @@ class CanonicalCategoryCreate(CanonicalCategoryBase):
 
 class CanonicalCategoryRead(CanonicalCategoryBase):
     """Schema for reading a canonical category."""
-    model_config = ConfigDict(from_attributes=True)
+    model_config = ConfigDict(from_attributes=True, defer_build=True)
 
     id: str
     created_at: datetime
@@ -414,7 +425,7 @@ class CategoryMappingUpdate(BaseModel):
 
 class CategoryMappingRead(BaseModel):
     """Schema for reading a category mapping."""
-    model_config = ConfigDict(from_attributes=True)
+    model_config = ConfigDict(from_attributes=True, defer_build=True)
 
     id: str
     source_type: str
@@ -437,6 +448,7 @@ class CategorySuggestionAlt(BaseModel):
 
 class CategorySuggestionRead(BaseModel):
     """AI-generated suggestion for mapping a category."""
+    model_config = ConfigDict(defer_build=True)
     raw_category: str
     canonical_category_id: str
     canonical_category_name: str
@@ -457,6 +469,7 @@ class CategoryComparisonItem(BaseModel):
 
 class CategoryComparisonResponse(BaseModel):
     """Response for semantic category comparison."""
+    model_config = ConfigDict(defer_build=True)
     comparisons: list[CategoryComparisonItem]
     unmapped_operator_categories: list[str]
     unmapped_competitor_categories: list[str]
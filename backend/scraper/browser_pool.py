@@ -6,12 +6,20 @@ Initializes browser at application startup to avoid slow startup on each request
 
 from __future__ import annotations
 
+import os
 import threading
+from pathlib import Path
 from typing import Optional, TYPE_CHECKING
 
 # Only import for type hints - actual import is lazy
 if TYPE_CHECKING:
-    from playwright.sync_api import Browser, Playwright
+    from playwright.sync_api import BrowserContext, Playwright
+
+# On-disk Chromium profile so cookies, localStorage, and HTTP cache
+# survive process restarts (warm start instead of a fresh login)
+PROFILE_DIR = os.getenv(
+    "CHROMIUM_PROFILE_DIR", str(Path(__file__).parent / ".chromium-profile")
+)
 
 
 class BrowserPool:
@@ -22,37 +30,41 @@ class BrowserPool:
     """
 
     _instance: Optional['BrowserPool'] = None
-    _lock = threading.Lock()
 
     def __init__(self):
         self._playwright: Optional[Playwright] = None
-        self._browser: Optional[Browser] = None
-        self._initialized = False
+        self._context: Optional[BrowserContext] = None
+        # Guards initialize/shutdown only; the hot path reads the Event
+        self._init_lock = threading.Lock()
+        self._ready = threading.Event()
 
     @classmethod
     def get_instance(cls) -> 'BrowserPool':
-        """Get the singleton instance."""
+        """Get the singleton instance (constructed at import time below)."""
+        # Module import holds the interpreter's import lock, so plain
+        # check-and-assign is race-free here - no double-checked locking
         if cls._instance is None:
-            with cls._lock:
-                if cls._instance is None:
-                    cls._instance = cls()
+            cls._instance = cls()
         return cls._instance
 
     def initialize(self) -> None:
         """Initialize Playwright and launch browser. Call this at app startup."""
-        if self._initialized:
+        if self._ready.is_set():
             return
 
-        with self._lock:
-            if self._initialized:
+        with self._init_lock:
+            if self._ready.is_set():
                 return
 
             print("BrowserPool: Initializing Playwright...")
             # Import playwright only when needed (lazy import)
             from playwright.sync_api import sync_playwright
             self._playwright = sync_playwright().start()
-            print("BrowserPool: Launching browser...")
-            self._browser = self._playwright.chromium.launch(
+            print("BrowserPool: Launching browser with persistent profile...")
+            # Persistent context keeps login cookies and cache on disk, so
+            # restarts skip the full login flow
+            self._context = self._playwright.chromium.launch_persistent_context(
+                user_data_dir=PROFILE_DIR,
                 headless=True,
                 timeout=180000,  # 3 minute timeout for browser launch
                 args=[
@@ -64,24 +76,29 @@ class BrowserPool:
                     "--disable-gpu",
                 ]
             )
-            self._initialized = True
+            self._ready.set()
             print("BrowserPool: Browser ready!")
 
-    def get_browser(self) -> Browser:
-        """Get the browser instance. Initializes if not already done."""
-        if not self._initialized:
+    def get_context(self) -> BrowserContext:
+        """Get the shared persistent context. Initializes if not already done."""
+        # Event.is_set() is a single atomic read - no lock once warm
+        if not self._ready.is_set():
             self.initialize()
-        return self._browser
+        return self._context
 
     def shutdown(self) -> None:
         """Shutdown browser and playwright."""
-        with self._lock:
-            if self._browser:
+        with self._init_lock:
+            self._ready.clear()
+
+            # Closing the persistent context tears down its Chromium too
+            # (launch_persistent_context exposes no separate Browser)
+            if self._context:
                 try:
-                    self._browser.close()
+                    self._context.close()
                 except Exception:
                     pass
-                self._browser = None
+                self._context = None
 
             if self._playwright:
                 try:
@@ -90,7 +107,6 @@ class BrowserPool:
                     pass
                 self._playwright = None
 
-            self._initialized = False
             print("BrowserPool: Shutdown complete")
 
 
@@ -98,9 +114,9 @@ class BrowserPool:
 browser_pool = BrowserPool.get_instance()
 
 
-def get_browser() -> Browser:
-    """Get the global browser instance."""
-    return browser_pool.get_browser()
+def get_context() -> BrowserContext:
+    """Get the global persistent browser context."""
+    return browser_pool.get_context()
 
 
 def initialize_browser() -> None:
@@ -1,35 +1,119 @@
+from __future__ import annotations
+
 import asyncio
 import os
 import random
+import re
 import json
+import time
 from datetime import datetime
 from decimal import Decimal
 from pathlib import Path
-from typing import Optional
+from typing import Optional, TYPE_CHECKING
 from dataclasses import dataclass, field
 
-from bs4 import BeautifulSoup
-from playwright.async_api import Page, TimeoutError as PlaywrightTimeout
+import httpx
+import orjson
+
+# bs4 and playwright are imported lazily at their call sites so modules
+# that merely reference DoorDashScraper don't pay their import cost
+if TYPE_CHECKING:
+    from playwright.async_api import Page
+
+try:
+    # C-based HTML parser, much faster than html.parser for full-page walks
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
 
-from .stealth_browser import StealthBrowser
+from .stealth_browser import StealthBrowser, USER_AGENTS, get_shared_browser
 
 
 # Cookie storage path
 COOKIES_FILE = Path(__file__).parent / ".doordash_cookies.json"
 
-
-@dataclass
+# Precompiled price pattern shared by both parser paths
+PRICE_RE = re.compile(r'\$(\d+(?:\.\d{2})?)')
+
+
+def _price_to_cents(price_str: str) -> int:
+    """'9.99' -> 999, '9' -> 900 (PRICE_RE allows 0 or 2 decimals)."""
+    if '.' in price_str:
+        return int(price_str.replace('.', '', 1))
+    return int(price_str) * 100
+
+# Menu item elements come in several flavours across DoorDash page versions
+ITEM_SELECTORS = [
+    '[data-testid*="MenuItem"]',
+    '[data-testid*="menu-item"]',
+    '[data-anchor-id*="MenuItem"]',
+    'button[data-testid]',  # Menu items are often buttons
+]
+# Comma-union of the above: one compiled selector, one DOM pass
+ITEM_SELECTOR = ', '.join(ITEM_SELECTORS)
+
+# UI chrome that leaks into candidate item names, compiled into a single
+# alternation so each name is scanned once instead of once per pattern
+UI_PATTERNS = [
+    'sign up', 'log in', 'sign in', 'group order', 'see more', 'see less',
+    'items in cart', 'delivery fee', 'view cart', 'checkout', 'add to cart',
+    'schedule', 'asap', 'pickup only', 'delivery', 'featured', 'popular',
+    'most ordered', 'previous', 'next', '$0 delivery', 'promo', 'free delivery'
+]
+UI_RE = re.compile('|'.join(re.escape(p) for p in UI_PATTERNS), re.IGNORECASE)
+
+# Names that are just a price or number
+NUMERIC_RE = re.compile(r'^[\d.$]+$')
+
+# Class names that usually carry the item description
+DESC_RE = re.compile(r'description|desc', re.I)
+
+# Tags checked, in order, for an item's display name
+NAME_TAGS = ('h3', 'h4', 'span', 'p')
+
+# In-page extractor: collects candidate item cards and returns only the
+# name and text per card, so a few KB cross the CDP socket instead of the
+# multi-MB rendered HTML that page.content() would serialize
+# Single-quoted in the JS because the selectors themselves contain
+# double-quoted attribute values
+JS_EXTRACT_ITEMS = f"""
+() => Array.from(document.querySelectorAll('{ITEM_SELECTOR}')).map((el) => ({{
+    name: el.querySelector('{", ".join(NAME_TAGS)}')?.innerText || null,
+    text: el.innerText || '',
+}}))
+"""
+
+# Learned menu API endpoints, keyed by store URL
+SKILLS_FILE = Path(__file__).parent / ".doordash_skills.json"
+
+# Minimum item count for an API payload to be trusted as the full menu
+MIN_API_ITEMS = 3
+
+# How long a scraped menu stays fresh enough to serve from memory
+SCRAPE_CACHE_TTL = 300.0
+
+
+@dataclass(slots=True)
 class ScrapedMenuItem:
-    """Data class for a scraped menu item."""
+    """
+    Data class for a scraped menu item.
+
+    Prices are stored as integer cents on the hot path; Decimal objects
+    are only built at the serialization boundary via the price property.
+    """
     name: str
-    price: Decimal
+    price_cents: int = 0
     category: Optional[str] = None
     description: Optional[str] = None
     is_available: bool = True
     position: int = 0
 
+    @property
+    def price(self) -> Decimal:
+        return Decimal(self.price_cents).scaleb(-2)
+
 
-@dataclass
+@dataclass(slots=True)
 class ScrapeResult:
     """Result of a scraping operation."""
     restaurant_name: str
@@ -40,6 +124,18 @@ class ScrapeResult:
     error_message: Optional[str] = None
 
 
+def dumps_result(result: ScrapeResult) -> bytes:
+    """
+    Serialize a ScrapeResult to JSON bytes with orjson.
+
+    orjson walks dataclasses and datetimes natively in Rust, and with
+    prices stored as integer cents there is no Decimal left to need a
+    fallback encoder — bulk dumps of scrape_many output stay on the
+    fast path.
+    """
+    return orjson.dumps(result)
+
+
 class DoorDashScraper:
     """
     DoorDash menu scraper using Playwright with stealth measures and authentication.
@@ -52,55 +148,153 @@ class DoorDashScraper:
     LOGIN_URL = "https://identity.doordash.com/auth/user/login"
 
     def __init__(self, browser: Optional[StealthBrowser] = None):
+        # Optionally injected browser; otherwise the process-wide shared
+        # one is used so concurrent scrapes get a fresh context each, not
+        # a whole Chromium each
         self._browser = browser
-        self._owns_browser = browser is None
         self._context = None
         self._is_logged_in = False
+        # Single-flight guard: a warm-up login and a scrape-triggered
+        # login must not run the flow twice
+        self._login_lock = asyncio.Lock()
+        # Recent results by URL so retry loops and multi-platform
+        # comparisons don't re-run the whole browser round-trip
+        self._scrape_cache: dict[str, tuple[float, ScrapeResult]] = {}
+        self._scrape_cache_ttl = SCRAPE_CACHE_TTL
+
+    # Contexts pooled per login identity: creation plus cookie injection
+    # costs hundreds of ms, so repeated scrapes reuse one context and it
+    # is only torn down at process shutdown
+    _context_pool: dict = {}
+    # Single-flight guard for pool misses: concurrent first scrapes must
+    # not each build a context and overwrite the same key, leaking all
+    # but the last on the shared session
+    _context_pool_lock = asyncio.Lock()
 
     async def _get_browser(self) -> StealthBrowser:
-        """Get or create a browser instance."""
-        if self._browser is None:
-            self._browser = StealthBrowser(headless=True)
-            await self._browser.start()
-        return self._browser
+        """Get the injected browser or the process-wide shared one."""
+        if self._browser is not None:
+            return self._browser
+        return await get_shared_browser()
+
+    @classmethod
+    async def _live_pooled_context(cls, key: str):
+        """Return the pooled context for key, dropping it if its browser died."""
+        context = cls._context_pool.get(key)
+        if context is None:
+            return None
+        # A pooled context outlives session rotations and retry restarts
+        # of the shared connection; hand it back only if its browser is
+        # still connected (None means a local persistent launch, which
+        # has no remote session to lose)
+        owner = context.browser
+        if owner is None or owner.is_connected():
+            return context
+        cls._context_pool.pop(key, None)
+        try:
+            await context.close()
+        except Exception:
+            pass
+        return None
+
+    async def _get_context(self):
+        """Get the pooled context for the configured account, creating it once."""
+        key = os.environ.get("DOORDASH_EMAIL") or "anonymous"
+        context = await self._live_pooled_context(key)
+        if context is not None:
+            return context
+
+        async with DoorDashScraper._context_pool_lock:
+            # Re-check under the lock: another task may have built the
+            # context while this one waited
+            context = await self._live_pooled_context(key)
+            if context is not None:
+                return context
+
+            browser = await self._get_browser()
+            context = await browser.create_context()
+            saved_cookies = self._load_cookies()
+            if saved_cookies:
+                await context.add_cookies(saved_cookies)
+                print("Added saved cookies to context")
+            DoorDashScraper._context_pool[key] = context
+            return context
+
+    @classmethod
+    async def close_contexts(cls) -> None:
+        """Close all pooled contexts (called on app shutdown)."""
+        for context in cls._context_pool.values():
+            try:
+                await context.close()
+            except Exception:
+                pass
+        cls._context_pool.clear()
 
     async def close(self) -> None:
-        """Close the browser if we own it."""
-        if self._context:
-            await self._context.close()
-            self._context = None
-        if self._owns_browser and self._browser:
-            await self._browser.stop()
-            self._browser = None
+        """Release this scraper; pooled contexts and the shared browser stay up."""
+        self._context = None
+        self._browser = None
 
     async def _random_delay(self, min_sec: float = 1.0, max_sec: float = 3.0) -> None:
         """Add random delay to appear more human-like."""
         await asyncio.sleep(random.uniform(min_sec, max_sec))
 
-    async def _scroll_page(self, page: Page) -> None:
-        """Scroll through the page to load lazy content."""
-        scroll_height = await page.evaluate("document.body.scrollHeight")
-
-        current_position = 0
-        while current_position < scroll_height:
-            scroll_amount = random.randint(300, 500)
-            current_position += scroll_amount
+    async def _wait_for_menu(self, page: Page, timeout: int = 15000) -> None:
+        """Wait until menu item nodes exist; proceed anyway on timeout."""
+        from playwright.async_api import TimeoutError as PlaywrightTimeout
 
-            await page.evaluate(f"window.scrollTo(0, {current_position})")
-            await self._random_delay(0.3, 0.7)
+        try:
+            await page.wait_for_selector(
+                '[data-testid*="MenuItem"], [data-anchor-id]', timeout=timeout
+            )
+        except PlaywrightTimeout:
+            print("Menu selector never appeared, continuing with page as-is")
 
-            new_height = await page.evaluate("document.body.scrollHeight")
-            if new_height > scroll_height:
-                scroll_height = new_height
+    async def _scroll_page(self, page: Page) -> None:
+        """
+        Scroll through the page to load lazy content.
 
-        await page.evaluate("window.scrollTo(0, 0)")
-        await self._random_delay(0.5, 1.0)
+        The whole scroll-and-wait loop runs inside the browser in a
+        single evaluate call, instead of paying a CDP round-trip per
+        scroll step, height read, and delay. Pages that render the full
+        menu up-front exit early: once the item count holds steady for
+        three consecutive steps there is nothing left to lazy-load.
+        """
+        await page.evaluate("""async () => {
+            const sleep = (ms) => new Promise((resolve) => setTimeout(resolve, ms));
+            const countItems = () =>
+                document.querySelectorAll("[data-testid*='MenuItem'], [data-anchor-id]").length;
+            let position = 0;
+            let lastCount = countItems();
+            let stable = 0;
+            while (position < document.body.scrollHeight) {
+                position += 300 + Math.random() * 200;
+                window.scrollTo(0, position);
+                await sleep(300 + Math.random() * 400);
+                const n = countItems();
+                if (n === lastCount) {
+                    stable += 1;
+                    if (stable >= 3) break;
+                } else {
+                    stable = 0;
+                    lastCount = n;
+                }
+            }
+            window.scrollTo(0, 0);
+        }""")
+
+    # Parsed cookie cache keyed by file mtime, shared across instances so
+    # every scrape doesn't re-read and re-parse the same JSON file
+    _cookie_cache: Optional[tuple[float, list]] = None
 
     def _save_cookies(self, cookies: list) -> None:
-        """Save cookies to file for reuse."""
+        """Save cookies to file for reuse (atomic write, C-speed serializer)."""
         try:
-            with open(COOKIES_FILE, "w") as f:
-                json.dump(cookies, f)
+            # Write-then-rename so a crash mid-write can't corrupt the file
+            tmp = COOKIES_FILE.with_suffix(".json.tmp")
+            tmp.write_bytes(orjson.dumps(cookies))
+            tmp.replace(COOKIES_FILE)
+            DoorDashScraper._cookie_cache = None
             print(f"Cookies saved to {COOKIES_FILE}")
         except Exception as e:
             print(f"Failed to save cookies: {e}")
@@ -109,14 +303,171 @@ class DoorDashScraper:
         """Load cookies from file if available."""
         try:
             if COOKIES_FILE.exists():
-                with open(COOKIES_FILE, "r") as f:
-                    cookies = json.load(f)
+                mtime = COOKIES_FILE.stat().st_mtime
+                cached = DoorDashScraper._cookie_cache
+                if cached is not None and cached[0] == mtime:
+                    return cached[1]
+                cookies = orjson.loads(COOKIES_FILE.read_bytes())
+                DoorDashScraper._cookie_cache = (mtime, cookies)
                 print(f"Loaded {len(cookies)} cookies from file")
                 return cookies
         except Exception as e:
             print(f"Failed to load cookies: {e}")
         return None
 
+    def _load_skills(self) -> dict:
+        """Load learned menu API endpoints from file."""
+        try:
+            if SKILLS_FILE.exists():
+                with open(SKILLS_FILE, "r") as f:
+                    return json.load(f)
+        except Exception as e:
+            print(f"Failed to load API skills: {e}")
+        return {}
+
+    def _save_skills(self, skills: dict) -> None:
+        """Persist learned menu API endpoints to file."""
+        try:
+            with open(SKILLS_FILE, "w") as f:
+                json.dump(skills, f)
+        except Exception as e:
+            print(f"Failed to save API skills: {e}")
+
+    def _cookie_jar(self) -> httpx.Cookies:
+        """Build an httpx cookie jar from the saved browser cookies."""
+        jar = httpx.Cookies()
+        for cookie in self._load_cookies() or []:
+            try:
+                jar.set(
+                    cookie["name"],
+                    cookie["value"],
+                    domain=cookie.get("domain", ""),
+                    path=cookie.get("path", "/"),
+                )
+            except Exception:
+                continue
+        return jar
+
+    # Fields whose integer values the DoorDash APIs quote in cents;
+    # floats and display strings always quote dollars
+    _CENT_FIELDS = frozenset({"price", "unitAmount"})
+
+    @classmethod
+    def _parse_json_price(cls, raw, field: str) -> Optional[int]:
+        """
+        Parse a JSON price field into cents. Units come from the field
+        name, not the magnitude: integers in cent-denominated fields pass
+        through unchanged, everything else is treated as dollars.
+        """
+        try:
+            if isinstance(raw, bool):
+                return None
+            if isinstance(raw, int):
+                return raw if field in cls._CENT_FIELDS else raw * 100
+            if isinstance(raw, float):
+                return round(raw * 100)
+            if isinstance(raw, str):
+                match = re.search(r'(\d+(?:\.\d{2})?)', raw)
+                if match:
+                    return _price_to_cents(match.group(1))
+        except Exception:
+            return None
+        return None
+
+    def _extract_items_from_json(self, data) -> list[ScrapedMenuItem]:
+        """
+        Walk an arbitrary menu API payload and pull out item dicts.
+
+        Any dict carrying both a name and a price key is treated as an
+        item; the nearest enclosing named node is used as its category.
+        """
+        items: list[ScrapedMenuItem] = []
+        seen_names: set[str] = set()
+
+        def visit(node, category: Optional[str]) -> None:
+            if isinstance(node, dict):
+                name = node.get("name") or node.get("title")
+                price_field, price_raw = next(
+                    ((k, node[k]) for k in ("price", "displayPrice", "unitAmount") if k in node),
+                    (None, None),
+                )
+                if isinstance(name, str) and price_raw is not None:
+                    price_cents = self._parse_json_price(price_raw, price_field)
+                    if price_cents is not None and name not in seen_names and not self._is_ui_element(name):
+                        description = node.get("description")
+                        items.append(ScrapedMenuItem(
+                            name=name,
+                            price_cents=price_cents,
+                            category=category,
+                            description=description if isinstance(description, str) else None,
+                            position=len(items),
+                        ))
+                        seen_names.add(name)
+                    return
+                child_category = name if isinstance(name, str) else category
+                for value in node.values():
+                    if isinstance(value, (dict, list)):
+                        visit(value, child_category)
+            elif isinstance(node, list):
+                for value in node:
+                    visit(value, category)
+
+        visit(data, None)
+        return items
+
+    async def _scrape_via_api(self, url: str) -> Optional[list[ScrapedMenuItem]]:
+        """
+        Try the menu API endpoint recorded for this store, if any.
+
+        Hits the endpoint directly with httpx using the saved cookies,
+        skipping the browser entirely. Returns None on any failure so the
+        caller falls back to the Playwright path; a stale skill (schema
+        changed, too few items) is dropped so it gets re-learned.
+        """
+        skill = self._load_skills().get(url)
+        if not skill:
+            return None
+
+        try:
+            headers = {
+                "User-Agent": random.choice(USER_AGENTS),
+                "Accept": "application/json",
+            }
+            async with httpx.AsyncClient(
+                cookies=self._cookie_jar(),
+                headers=headers,
+                timeout=15.0,
+                follow_redirects=True,
+            ) as client:
+                response = await client.get(skill["endpoint"])
+                response.raise_for_status()
+                data = response.json()
+        except (httpx.HTTPError, KeyError, ValueError) as e:
+            print(f"Menu API request failed for {url}: {e}")
+            return None
+
+        items = self._extract_items_from_json(data)
+        if len(items) >= MIN_API_ITEMS:
+            print(f"Scraped {len(items)} items via cached API endpoint (no browser)")
+            return items
+
+        # Payload no longer looks like a menu - forget the endpoint
+        print(f"Cached API endpoint returned too few items, dropping skill for {url}")
+        skills = self._load_skills()
+        skills.pop(url, None)
+        self._save_skills(skills)
+        return None
+
+    def _learn_api_skill(self, url: str, captured: list[tuple[str, object]]) -> None:
+        """Record the first captured API response that yields a full menu."""
+        for endpoint, payload in captured:
+            if len(self._extract_items_from_json(payload)) >= MIN_API_ITEMS:
+                skills = self._load_skills()
+                skills[url] = {"endpoint": endpoint}
+                self._save_skills(skills)
+                print(f"Recorded menu API endpoint for {url}")
+                return
+
     async def _check_if_logged_in(self, page: Page) -> bool:
         """Check if we're currently logged into DoorDash."""
         try:
@@ -153,17 +504,17 @@ class DoorDashScraper:
             print("DoorDash credentials not provided")
             return False
 
-        browser = await self._get_browser()
+        async with self._login_lock:
+            if self._is_logged_in:
+                return True
+            return await self._login_locked(email, password)
 
-        # Create a persistent context
-        if self._context is None:
-            self._context = await browser.create_context()
+    async def _login_locked(self, email: str, password: str) -> bool:
+        """Run the actual login flow; caller holds the login lock."""
+        from playwright.async_api import TimeoutError as PlaywrightTimeout
 
-            # Try to load saved cookies
-            saved_cookies = self._load_cookies()
-            if saved_cookies:
-                await self._context.add_cookies(saved_cookies)
-                print("Added saved cookies to context")
+        # Pooled context comes with saved cookies already injected
+        self._context = await self._get_context()
 
         page = await self._context.new_page()
 
@@ -257,25 +608,47 @@ class DoorDashScraper:
                 pass
             return False
 
-    async def scrape(self, url: str) -> ScrapeResult:
+    def clear_cache(self) -> None:
+        """Drop all cached scrape results."""
+        self._scrape_cache.clear()
+
+    async def scrape(self, url: str, force: bool = False) -> ScrapeResult:
         """
         Scrape menu items from a DoorDash restaurant page.
 
-        Will attempt to login if not already authenticated.
+        Will attempt to login if not already authenticated. Successful
+        results are cached in-process for SCRAPE_CACHE_TTL seconds so a
+        repeat of the same URL skips the browser entirely.
 
         Args:
             url: DoorDash restaurant URL
+            force: Bypass the cache and scrape fresh
 
         Returns:
             ScrapeResult with scraped menu items
         """
-        browser = await self._get_browser()
+        now = time.monotonic()
+        if not force:
+            cached = self._scrape_cache.get(url)
+            if cached is not None and now - cached[0] < self._scrape_cache_ttl:
+                print(f"Serving cached scrape result for {url}")
+                return cached[1]
+
         result = ScrapeResult(
             restaurant_name="Unknown",
             platform="doordash",
             items=[],
         )
 
+        # Fast path: hit the menu API endpoint learned from a previous
+        # scrape of this store - no browser session needed
+        api_items = await self._scrape_via_api(url)
+        if api_items:
+            result.items = api_items
+            result.success = True
+            self._scrape_cache[url] = (now, result)
+            return result
+
         # Ensure we're logged in
         if not self._is_logged_in:
             print("Not logged in, attempting login...")
@@ -283,27 +656,49 @@ class DoorDashScraper:
             if not login_success:
                 print("Login failed, attempting scrape without auth...")
 
-        # Create context if not exists
-        if self._context is None:
-            self._context = await browser.create_context()
-            saved_cookies = self._load_cookies()
-            if saved_cookies:
-                await self._context.add_cookies(saved_cookies)
+        # Pooled context comes with saved cookies already injected
+        self._context = await self._get_context()
 
         page = await self._context.new_page()
 
+        # Capture XHR/fetch JSON responses so we can learn the menu API
+        # endpoint and skip the browser on future scrapes of this store
+        captured: list[tuple[str, object]] = []
+
+        async def _capture_menu_response(response) -> None:
+            try:
+                if response.request.resource_type not in ("xhr", "fetch"):
+                    return
+                if "json" not in response.headers.get("content-type", ""):
+                    return
+                lowered = response.url.lower()
+                if "menu" not in lowered and "graphql" not in lowered:
+                    return
+                captured.append((response.url, await response.json()))
+            except Exception:
+                pass
+
+        page.on("response", _capture_menu_response)
+
         try:
             print(f"Navigating to restaurant page: {url}")
-            await page.goto(url, wait_until="domcontentloaded", timeout=60000)
-            await self._random_delay(3.0, 5.0)
+            await page.goto(url, wait_until="domcontentloaded", timeout=30000)
+            # Wait for actual menu nodes instead of a fixed multi-second
+            # delay; if they never render, the parser fallbacks still run
+            await self._wait_for_menu(page)
 
             # Scroll to load all menu items
             print("Scrolling to load menu items...")
             await self._scroll_page(page)
-            await self._random_delay(1.0, 2.0)
-
-            # Get HTML and parse
-            html = await page.content()
+            # Bounded wait instead of jittered sleep: return the moment
+            # enough lazy-loaded items exist, give up quietly otherwise
+            try:
+                await page.wait_for_function(
+                    "() => document.querySelectorAll('[data-testid*=MenuItem], [data-anchor-id]').length > 5",
+                    timeout=10000,
+                )
+            except Exception:
+                pass
 
             # Try to get restaurant name
             try:
@@ -313,7 +708,22 @@ class DoorDashScraper:
             except:
                 pass
 
-            items = self._parse_menu_html(html)
+            # In-page extraction first: one evaluate call returns compact
+            # {name, text} pairs instead of shipping the multi-MB rendered
+            # HTML over the CDP socket
+            items: list[ScrapedMenuItem] = []
+            try:
+                raw = await page.evaluate(JS_EXTRACT_ITEMS)
+                items = self._items_from_in_page(raw)
+            except Exception as e:
+                print(f"In-page extraction failed: {e}")
+
+            if len(items) < MIN_API_ITEMS:
+                # Fall back to the full HTML parse and its richer
+                # heuristics. Parsing is CPU-bound; run it off the event
+                # loop so concurrent scrapes keep making progress
+                html = await page.content()
+                items = await asyncio.to_thread(self._parse_menu_html, html)
             result.items = items
             result.success = len(items) > 0
 
@@ -321,6 +731,8 @@ class DoorDashScraper:
                 result.error_message = "No menu items found"
             else:
                 print(f"Found {len(items)} menu items")
+                self._learn_api_skill(url, captured)
+                self._scrape_cache[url] = (now, result)
 
         except Exception as e:
             result.success = False
@@ -331,41 +743,199 @@ class DoorDashScraper:
 
         return result
 
+    async def scrape_many(self, urls: list[str], concurrency: int = 8) -> list[ScrapeResult]:
+        """
+        Scrape several restaurant pages concurrently against one shared
+        browser - each scrape gets its own page, not its own Chromium.
+
+        Args:
+            urls: DoorDash restaurant URLs
+            concurrency: Cap on simultaneous scrapes. Browserless free
+                tier's 60s session budget is shared, so keep this modest.
+
+        Returns:
+            ScrapeResults in the same order as urls.
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def scrape_one(url: str) -> ScrapeResult:
+            async with semaphore:
+                try:
+                    return await self.scrape(url)
+                except Exception as e:
+                    # Contain per-URL failures so the group isn't cancelled
+                    return ScrapeResult(
+                        restaurant_name="Unknown",
+                        success=False,
+                        error_message=str(e),
+                    )
+
+        # TaskGroup gives structured concurrency: if the batch itself is
+        # cancelled (e.g. app shutdown mid-scrape), in-flight tasks are
+        # cancelled with it instead of leaking against a dead session
+        async with asyncio.TaskGroup() as tg:
+            tasks = [tg.create_task(scrape_one(url)) for url in urls]
+        return [task.result() for task in tasks]
+
+    def _items_from_in_page(self, raw: list[dict]) -> list[ScrapedMenuItem]:
+        """
+        Build menu items from the {name, text} pairs returned by the
+        in-page extractor. Only the price regex and name filters run here;
+        all DOM work already happened inside the browser.
+        """
+        items = []
+        position = 0
+        seen_names = set()
+
+        for card in raw:
+            text = card.get("text") or ""
+            name = (card.get("name") or "").strip()
+            if not (3 < len(name) < 100):
+                # Fall back to the first plausible line of the card text
+                name = next(
+                    (line.strip() for line in text.split('\n')
+                     if 3 < len(line.strip()) < 100),
+                    "",
+                )
+            if not name or name in seen_names or self._is_ui_element(name):
+                continue
+
+            price_match = PRICE_RE.search(text)
+            if not price_match:
+                continue
+
+            items.append(ScrapedMenuItem(
+                name=name,
+                price_cents=_price_to_cents(price_match.group(1)),
+                position=position,
+            ))
+            seen_names.add(name)
+            position += 1
+
+        return items
+
     def _parse_menu_html(self, html: str) -> list[ScrapedMenuItem]:
         """
         Parse menu items from DoorDash HTML.
+
+        Uses selectolax's C-based lexbor parser when available (the
+        pure-Python tree walk is the CPU bottleneck on big pages), with
+        BeautifulSoup as the fallback.
         """
-        soup = BeautifulSoup(html, "html.parser")
+        if LexborHTMLParser is not None:
+            return self._parse_menu_lexbor(html)
+        return self._parse_menu_bs4(html)
+
+    def _parse_menu_lexbor(self, html: str) -> list[ScrapedMenuItem]:
+        """
+        Parse menu items with selectolax (fast path).
+
+        Single DFS over the node tree: each node is classified once as a
+        category header, menu item, or fallback candidate, instead of
+        running separate full-document passes per selector.
+        """
+        tree = LexborHTMLParser(html)
         items = []
         position = 0
         current_category = None
+        seen_names = set()  # Avoid duplicates
+        fallback_candidates = []
+
+        for node in tree.root.traverse(include_text=False):
+            tag = node.tag
+            attrs = node.attributes
+            testid = attrs.get('data-testid') or ''
+
+            # Category headers update the running category in document order
+            if tag in ('section', 'div') and testid:
+                lowered = testid.lower()
+                if 'category' in lowered or 'header' in lowered:
+                    header = node.css_first('h2, h3, span')
+                    if header:
+                        current_category = header.text(strip=True)
+                    continue
 
-        # DoorDash menu structure: categories with items inside
-        # Look for menu sections/categories
-
-        # Try to find category headers and their items
-        for section in soup.find_all(['section', 'div'], attrs={'data-testid': True}):
-            testid = section.get('data-testid', '')
+            anchor_id = attrs.get('data-anchor-id') or ''
+            is_item = (
+                'MenuItem' in testid
+                or 'menu-item' in testid
+                or 'MenuItem' in anchor_id
+                or (tag == 'button' and testid)
+            )
+            if is_item:
+                item = self._extract_item_from_node(node, position, current_category)
+                if item and item.name not in seen_names:
+                    # Filter out UI elements
+                    if not self._is_ui_element(item.name):
+                        items.append(item)
+                        seen_names.add(item.name)
+                        position += 1
+            elif tag in ('button', 'a'):
+                fallback_candidates.append((node, current_category))
 
-            # Check if this is a category header
-            if 'category' in testid.lower() or 'header' in testid.lower():
-                header = section.find(['h2', 'h3', 'span'])
-                if header:
-                    current_category = header.get_text(strip=True)
+        # Fallback: price-bearing clickables collected during the same pass
+        if len(items) < 3:
+            for node, category in fallback_candidates:
+                # '$' in text is a C-level scan that rejects most
+                # candidates before the regex engine runs
+                text = node.text()
+                if '$' not in text or not PRICE_RE.search(text):
                     continue
+                item = self._extract_item_from_node(node, position, category)
+                if item and item.name not in seen_names and not self._is_ui_element(item.name):
+                    items.append(item)
+                    seen_names.add(item.name)
+                    position += 1
 
-        # Look for menu item elements with various patterns
-        item_selectors = [
-            '[data-testid*="MenuItem"]',
-            '[data-testid*="menu-item"]',
-            '[data-anchor-id*="MenuItem"]',
-            'button[data-testid]',  # Menu items are often buttons
-        ]
+        return items
 
+    def _parse_menu_bs4(self, html: str) -> list[ScrapedMenuItem]:
+        """
+        Parse menu items with BeautifulSoup (fallback when selectolax is
+        unavailable).
+
+        Mirrors the lexbor path: one pre-order walk over the tree
+        classifies each element as a category header, menu item, or
+        fallback candidate, instead of a full find_all/select pass per
+        selector flavour. Document order also keeps items attributed to
+        the header most recently seen above them.
+        """
+        from bs4 import BeautifulSoup, FeatureNotFound, Tag
+
+        try:
+            # lxml parses multi-MB pages several times faster than the
+            # pure-Python html.parser backend
+            soup = BeautifulSoup(html, "lxml")
+        except FeatureNotFound:
+            soup = BeautifulSoup(html, "html.parser")
+        items = []
+        position = 0
+        current_category = None
         seen_names = set()  # Avoid duplicates
+        fallback_candidates = []
 
-        for selector in item_selectors:
-            for element in soup.select(selector):
+        for element in soup.descendants:
+            if not isinstance(element, Tag):
+                continue
+
+            testid = element.attrs.get('data-testid') or ''
+
+            # Category headers update the running category
+            if element.name in ('section', 'div') and testid and (
+                'category' in testid.lower() or 'header' in testid.lower()
+            ):
+                header = element.find(['h2', 'h3', 'span'])
+                if header:
+                    current_category = header.get_text(strip=True)
+                continue
+
+            anchor_id = element.attrs.get('data-anchor-id') or ''
+            if (
+                'MenuItem' in testid
+                or 'menu-item' in testid
+                or 'MenuItem' in anchor_id
+                or (element.name == 'button' and testid)
+            ):
                 item = self._extract_item_from_element(element, position, current_category)
                 if item and item.name not in seen_names:
                     # Filter out UI elements
@@ -373,54 +943,92 @@ class DoorDashScraper:
                         items.append(item)
                         seen_names.add(item.name)
                         position += 1
+            elif element.name in ('button', 'a'):
+                fallback_candidates.append((element, current_category))
 
-        # Fallback: look for price patterns and work backwards
+        # Fallback: look for price patterns in the candidates collected
+        # during the same walk
         if len(items) < 3:
-            import re
-            for element in soup.find_all(string=re.compile(r'\$\d+\.\d{2}')):
-                parent = element.find_parent(['div', 'button', 'a'])
-                if parent:
-                    item = self._extract_item_from_element(parent, position, current_category)
-                    if item and item.name not in seen_names and not self._is_ui_element(item.name):
-                        items.append(item)
-                        seen_names.add(item.name)
-                        position += 1
+            for element, category in fallback_candidates:
+                text = element.get_text()
+                # '$' in text rejects most candidates before the regex runs
+                if '$' not in text or not PRICE_RE.search(text):
+                    continue
+                item = self._extract_item_from_element(element, position, category)
+                if item and item.name not in seen_names and not self._is_ui_element(item.name):
+                    items.append(item)
+                    seen_names.add(item.name)
+                    position += 1
 
         return items
 
-    def _is_ui_element(self, name: str) -> bool:
-        """Check if name looks like a UI element rather than menu item."""
-        ui_patterns = [
-            'sign up', 'log in', 'sign in', 'group order', 'see more', 'see less',
-            'items in cart', 'delivery fee', 'view cart', 'checkout', 'add to cart',
-            'schedule', 'asap', 'pickup only', 'delivery', 'featured', 'popular',
-            'most ordered', 'previous', 'next', '$0 delivery', 'promo', 'free delivery'
-        ]
-        name_lower = name.lower().strip()
-
-        # Too short is suspicious
-        if len(name_lower) < 3:
-            return True
-
-        # Check against patterns
-        for pattern in ui_patterns:
-            if pattern in name_lower:
-                return True
+    def _extract_item_from_node(self, node, position: int, category: Optional[str] = None) -> Optional[ScrapedMenuItem]:
+        """Extract menu item data from a selectolax node."""
+        try:
+            # Try to find name - usually in h3, h4, or prominent span
+            name = None
+            for tag in NAME_TAGS:
+                name_node = node.css_first(tag)
+                if name_node:
+                    text = name_node.text(strip=True)
+                    # Name should be reasonable length
+                    if text and 3 < len(text) < 100:
+                        name = text
+                        break
+
+            full_text = node.text(separator='|', strip=True)
+            if not name:
+                # Try getting first significant text
+                for part in (p.strip() for p in full_text.split('|')):
+                    if part and 3 < len(part) < 100 and not part.startswith('$'):
+                        name = part
+                        break
 
-        # Pure numbers or very short
-        if name_lower.replace('$', '').replace('.', '').isdigit():
-            return True
+            if not name:
+                return None
 
-        return False
+            # Try to find price
+            price_cents = 0
+            price_match = PRICE_RE.search(full_text)
+            if price_match:
+                price_cents = _price_to_cents(price_match.group(1))
+
+            # Try to find description
+            description = None
+            desc_node = node.css_first('p')
+            if desc_node:
+                desc_text = desc_node.text(strip=True)
+                if desc_text and desc_text != name:
+                    description = desc_text
+
+            return ScrapedMenuItem(
+                name=name,
+                price_cents=price_cents,
+                category=category,
+                description=description,
+                position=position,
+            )
+
+        except Exception as e:
+            print(f"Error extracting item: {e}")
+            return None
+
+    def _is_ui_element(self, name: str) -> bool:
+        """Check if name looks like a UI element rather than menu item."""
+        name = name.strip()
+        # Too short, known UI chrome, or just a price/number
+        return (
+            len(name) < 3
+            or UI_RE.search(name) is not None
+            or NUMERIC_RE.match(name) is not None
+        )
 
     def _extract_item_from_element(self, element, position: int, category: Optional[str] = None) -> Optional[ScrapedMenuItem]:
         """Extract menu item data from a BeautifulSoup element."""
-        import re
-
         try:
             # Try to find name - usually in h3, h4, or prominent span
             name = None
-            for tag in ['h3', 'h4', 'span', 'p']:
+            for tag in NAME_TAGS:
                 name_elem = element.find(tag)
                 if name_elem:
                     text = name_elem.get_text(strip=True)
@@ -442,15 +1050,15 @@ class DoorDashScraper:
                 return None
 
             # Try to find price
-            price = Decimal("0.00")
+            price_cents = 0
             price_text = element.get_text()
-            price_match = re.search(r'\$(\d+(?:\.\d{2})?)', price_text)
+            price_match = PRICE_RE.search(price_text)
             if price_match:
-                price = Decimal(price_match.group(1))
+                price_cents = _price_to_cents(price_match.group(1))
 
             # Try to find description
             description = None
-            desc_elem = element.find('p') or element.find(class_=re.compile(r'description|desc', re.I))
+            desc_elem = element.find('p') or element.find(class_=DESC_RE)
             if desc_elem:
                 desc_text = desc_elem.get_text(strip=True)
                 if desc_text and desc_text != name:
@@ -458,7 +1066,7 @@ class DoorDashScraper:
 
             return ScrapedMenuItem(
                 name=name,
-                price=price,
+                price_cents=price_cents,
                 category=category,
                 description=description,
                 position=position,
@@ -472,28 +1080,45 @@ class DoorDashScraper:
         """
         Navigate to a DoorDash restaurant page and dump the full HTML for inspection.
         """
-        browser = await self._get_browser()
         output_path = Path(output_file)
 
         # Ensure logged in
         if not self._is_logged_in:
             await self.login()
 
-        if self._context is None:
-            self._context = await browser.create_context()
+        self._context = await self._get_context()
 
         page = await self._context.new_page()
 
         try:
             print(f"Navigating to: {url}")
-            await page.goto(url, wait_until="domcontentloaded", timeout=60000)
-            await self._random_delay(3.0, 5.0)
+            await page.goto(url, wait_until="domcontentloaded", timeout=30000)
+            await self._wait_for_menu(page)
             await self._scroll_page(page)
 
             html_content = await page.content()
             output_path.write_text(html_content, encoding="utf-8")
             print(f"HTML dumped to: {output_path.absolute()}")
 
+            # Selector report in one evaluate: probing each selector with
+            # its own locator().count() round-trip costs 40+ CDP messages
+            try:
+                report = await page.evaluate(
+                    """(sels) => Object.fromEntries(sels.map((s) => [s, {
+                        count: document.querySelectorAll(s).length,
+                        samples: Array.from(document.querySelectorAll(s))
+                            .slice(0, 5)
+                            .map((e) => e.textContent?.trim().slice(0, 50)),
+                    }]))""",
+                    ITEM_SELECTORS + ['[data-anchor-id]', 'h3', 'h4'],
+                )
+                for selector, info in report.items():
+                    print(f"  {selector}: {info['count']} matches")
+                    for sample in info['samples']:
+                        print(f"    - {sample!r}")
+            except Exception as e:
+                print(f"Selector report failed: {e}")
+
             return str(output_path.absolute())
 
         except Exception as e:
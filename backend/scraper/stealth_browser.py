@@ -7,7 +7,10 @@ from __future__ import annotations
 import asyncio
 import os
 import random
+import re
+import tempfile
 import time
+from pathlib import Path
 from typing import Optional, Callable, TypeVar, Awaitable, TYPE_CHECKING
 from contextlib import asynccontextmanager
 
@@ -32,13 +35,78 @@ class BrowserSessionExpiredError(Exception):
     pass
 
 
+# Resource types aborted on every page: the scrapers only need the DOM
+# and menu JSON, so images/fonts/media/styles are dead weight — on a
+# 60s Browserless session they're most of the bytes on the wire
+BLOCKED_RESOURCE_TYPES = frozenset({"image", "font", "media", "stylesheet"})
+
 # Pool of realistic user agents for rotation
-USER_AGENTS = [
+USER_AGENTS = (
     "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
     "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36",
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36",
-]
+)
+
+# Common desktop viewports, built once instead of per page creation
+_VIEWPORTS = (
+    {"width": 1920, "height": 1080},
+    {"width": 1366, "height": 768},
+    {"width": 1536, "height": 864},
+)
+
+# Dedicated generator so identity rotation doesn't share state with the
+# globally-seedable random module
+_RNG = random.Random()
+
+# Stealth init script, minified and built once: the same payload goes to
+# every context, so keep the per-creation CDP message small
+_STEALTH_INIT_JS = (
+    "Object.defineProperty(navigator,'webdriver',{get:()=>undefined});"
+    "Object.defineProperty(navigator,'plugins',{get:()=>[1,2,3,4,5]});"
+    "Object.defineProperty(navigator,'languages',{get:()=>['en-US','en']});"
+    "window.chrome={runtime:{}};"
+)
+
+# Materialized once so add_init_script can take path=: identical script
+# files let Chromium's V8 code cache reuse compiled bytecode across
+# contexts instead of re-parsing the source each time
+_STEALTH_INIT_PATH: Optional[Path] = Path(tempfile.gettempdir()) / "forkast_stealth_init.js"
+try:
+    _STEALTH_INIT_PATH.write_text(_STEALTH_INIT_JS)
+except OSError:
+    _STEALTH_INIT_PATH = None
+
+# On-disk Chromium profile for local launches so DNS, TLS sessions, and
+# the HTTP cache survive process restarts — a relaunch warm-starts
+# instead of re-resolving and re-handshaking every host. Browserless
+# sessions are remote and can't mount one
+_PROFILE_DIR = os.getenv(
+    "CHROMIUM_PROFILE_DIR", str(Path(__file__).parent / ".chromium-profile")
+)
+
+# Extra headers shared by every page
+_EXTRA_HEADERS = {
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.9",
+}
+
+# Error fragments that mean the Browserless session died, compiled into
+# one alternation so classification is a single scan of the message
+_SESSION_DEAD_PATTERNS = (
+    "target closed",
+    "protocol error",
+    "session closed",
+    "browser has been closed",
+    "connection closed",
+    "page closed",
+    "context closed",
+    "websocket error",
+    "net::err_connection_closed",
+)
+_SESSION_DEAD_RE = re.compile(
+    "|".join(map(re.escape, _SESSION_DEAD_PATTERNS)), re.IGNORECASE
+)
 
 
 class AsyncStealthBrowser:
@@ -47,10 +115,19 @@ class AsyncStealthBrowser:
     Falls back to local Playwright if no Browserless token is configured.
     """
 
-    def __init__(self, headless: bool = True):
+    def __init__(self, headless: bool = True, block_assets: bool = True):
         self._headless = headless
+        # Abort image/font/media/style requests in every context; turn
+        # off for debugging sessions that need a fully rendered page
+        self._block_assets = block_assets
         self._playwright: Optional[Playwright] = None
         self._browser: Optional[Browser] = None
+        # Long-lived context reused across pages; creating a context
+        # re-injects stealth scripts and costs ~100-300ms on Browserless
+        self._shared_context: Optional[BrowserContext] = None
+        # Set only for local launches: launch_persistent_context returns
+        # the profile-backed context directly (no Browser handle)
+        self._persistent_context: Optional[BrowserContext] = None
         self._browserless_token = os.getenv("BROWSERLESS_TOKEN")
 
         # Session management for Browserless.io 60s timeout
@@ -59,16 +136,25 @@ class AsyncStealthBrowser:
         self._session_buffer_seconds: int = 20  # Reconnect when 20s remaining
         self._reconnect_delay_seconds: float = 2.0  # Delay between reconnections
 
+        # Warmed spare Browserless session, dialed in the background as
+        # the current one nears expiry so the swap skips the 1-3s WSS
+        # handshake on the critical path
+        self._standby: Optional[Browser] = None
+        self._standby_created_at: Optional[float] = None
+        self._standby_task: Optional[asyncio.Task] = None
+
+        # Open pages across all contexts we created (counted via the
+        # context "page" event, so pages the scrapers open directly off
+        # pooled contexts are included). The browser is shared
+        # process-wide, so rotation must wait until no sibling scrape is
+        # mid-flight on the connection
+        self._pages_in_flight: int = 0
+
     def _get_random_user_agent(self) -> str:
-        return random.choice(USER_AGENTS)
+        return _RNG.choice(USER_AGENTS)
 
     def _get_random_viewport(self) -> dict:
-        viewports = [
-            {"width": 1920, "height": 1080},
-            {"width": 1366, "height": 768},
-            {"width": 1536, "height": 864},
-        ]
-        return random.choice(viewports)
+        return _RNG.choice(_VIEWPORTS)
 
     def get_session_age(self) -> float:
         """Returns seconds since session was created. Returns 0 if no session."""
@@ -107,31 +193,84 @@ class AsyncStealthBrowser:
             return
 
         remaining = self.get_remaining_time()
+        if remaining < required_time + self._session_buffer_seconds:
+            # Start dialing the replacement now so the swap below (or on
+            # the next call) finds a warmed connection waiting
+            self._kick_standby_warmer()
         if remaining < required_time:
-            print(f"Session has only {remaining:.1f}s remaining, reconnecting for fresh session...")
+            if self._pages_in_flight > 0:
+                # Sibling scrapes are mid-flight on this shared
+                # connection; rotating now would kill their pages. Run
+                # on the remaining time instead - the session-expired
+                # retry path recovers if it runs out
+                print(f"Session low ({remaining:.1f}s) but {self._pages_in_flight} page(s) in flight, deferring rotation")
+                return
+            print(f"Session has only {remaining:.1f}s remaining, swapping to fresh session...")
+            if await self._adopt_standby():
+                return
             await self.stop()
             await asyncio.sleep(self._reconnect_delay_seconds)  # Brief delay to avoid rate limits
             await self.start()
             print(f"Fresh session created with {self.get_remaining_time():.1f}s remaining")
 
+    def _kick_standby_warmer(self) -> None:
+        """Start warming a spare session unless one is ready or dialing."""
+        if self._standby is None and self._standby_task is None:
+            self._standby_task = asyncio.create_task(self._warm_standby())
+
+    async def _warm_standby(self) -> None:
+        """Dial a spare Browserless session off the critical path."""
+        try:
+            self._standby = await self._connect_browserless()
+            self._standby_created_at = time.time()
+        except Exception as e:
+            print(f"Standby session warm-up failed: {e}")
+        finally:
+            self._standby_task = None
+
+    async def _adopt_standby(self) -> bool:
+        """Swap to the warmed standby session; False if none is usable."""
+        standby = self._standby
+        if standby is None:
+            return False
+        self._standby = None
+
+        age = time.time() - (self._standby_created_at or 0.0)
+        if age > self._session_timeout_seconds - self._session_buffer_seconds:
+            # The spare sat unused too long; its 60s clock is nearly up too
+            asyncio.ensure_future(self._close_quietly(standby))
+            return False
+
+        old_browser = self._browser
+        old_context = self._shared_context
+        self._shared_context = None
+        self._browser = standby
+        self._session_created_at = self._standby_created_at
+        # Retire the old connection in the background
+        if old_browser is not None:
+            asyncio.ensure_future(self._close_quietly(old_browser, old_context))
+        print(f"Swapped to warmed standby session ({self.get_remaining_time():.1f}s remaining)")
+        return True
+
+    @staticmethod
+    async def _close_quietly(browser, context=None) -> None:
+        """Close a retired context/browser without surfacing errors."""
+        if context is not None:
+            try:
+                await context.close()
+            except Exception:
+                pass
+        try:
+            await browser.close()
+        except Exception:
+            pass
+
     def _is_session_expired_error(self, error: Exception) -> bool:
         """
         Check if an error indicates the Browserless session has expired.
         Returns True for session expiry, False for other errors.
         """
-        error_str = str(error).lower()
-        session_expired_patterns = [
-            "target closed",
-            "protocol error",
-            "session closed",
-            "browser has been closed",
-            "connection closed",
-            "page closed",
-            "context closed",
-            "websocket error",
-            "net::err_connection_closed",
-        ]
-        return any(pattern in error_str for pattern in session_expired_patterns)
+        return _SESSION_DEAD_RE.search(str(error)) is not None
 
     async def with_session_retry(
         self,
@@ -176,9 +315,50 @@ class AsyncStealthBrowser:
                 # Non-session error, re-raise immediately
                 raise
 
+    async def _connect_browserless(self) -> Browser:
+        """
+        Dial a fresh Browserless.io session with retry and exponential
+        backoff for rate limits. Returns the connected Browser.
+        """
+        # timeout=60000 is max for free tier (60 seconds)
+        max_retries = 3
+        base_delay = 5  # seconds
+
+        for attempt in range(max_retries):
+            try:
+                print(f"Connecting to Browserless.io (attempt {attempt + 1}/{max_retries})...")
+                ws_url = f"wss://chrome.browserless.io?token={self._browserless_token}&timeout=60000"
+                return await self._playwright.chromium.connect_over_cdp(
+                    ws_url,
+                    timeout=60000  # 60 second connection timeout
+                )
+            except Exception as e:
+                error_str = str(e).lower()
+
+                if "429" in str(e) or "too many requests" in error_str:
+                    if attempt < max_retries - 1:
+                        delay = base_delay * (2 ** attempt)
+                        print(f"Rate limited, waiting {delay}s before retry...")
+                        await asyncio.sleep(delay)
+                        continue
+                    raise BrowserlessRateLimitError(
+                        "Browserless.io rate limit exceeded. Please wait a moment and try again."
+                    )
+                elif "400" in str(e) or "bad request" in error_str:
+                    raise BrowserConnectionError(
+                        "Invalid Browserless.io configuration. Check your token."
+                    )
+                else:
+                    if attempt < max_retries - 1:
+                        delay = base_delay * (2 ** attempt)
+                        print(f"Connection failed: {e}, retrying in {delay}s...")
+                        await asyncio.sleep(delay)
+                        continue
+                    raise BrowserConnectionError(f"Failed to connect to Browserless.io: {e}")
+
     async def start(self) -> None:
         """Connect to Browserless.io or launch local browser."""
-        if self._browser is not None:
+        if self._browser is not None or self._persistent_context is not None:
             return
 
         from playwright.async_api import async_playwright
@@ -186,57 +366,31 @@ class AsyncStealthBrowser:
 
         if self._browserless_token:
             # Use Browserless.io - much faster!
-            # timeout=60000 is max for free tier (60 seconds)
-            # Retry with exponential backoff for rate limits
-            max_retries = 3
-            base_delay = 5  # seconds
-
-            for attempt in range(max_retries):
-                try:
-                    print(f"Connecting to Browserless.io (attempt {attempt + 1}/{max_retries})...")
-                    ws_url = f"wss://chrome.browserless.io?token={self._browserless_token}&timeout=60000"
-                    self._browser = await self._playwright.chromium.connect_over_cdp(
-                        ws_url,
-                        timeout=60000  # 60 second connection timeout
-                    )
-                    self._session_created_at = time.time()
-                    print(f"Connected to Browserless.io! Session timeout: {self._session_timeout_seconds}s")
-                    return
-                except Exception as e:
-                    error_str = str(e).lower()
-
-                    if "429" in str(e) or "too many requests" in error_str:
-                        if attempt < max_retries - 1:
-                            delay = base_delay * (2 ** attempt)
-                            print(f"Rate limited, waiting {delay}s before retry...")
-                            await asyncio.sleep(delay)
-                            continue
-                        raise BrowserlessRateLimitError(
-                            "Browserless.io rate limit exceeded. Please wait a moment and try again."
-                        )
-                    elif "400" in str(e) or "bad request" in error_str:
-                        raise BrowserConnectionError(
-                            "Invalid Browserless.io configuration. Check your token."
-                        )
-                    else:
-                        if attempt < max_retries - 1:
-                            delay = base_delay * (2 ** attempt)
-                            print(f"Connection failed: {e}, retrying in {delay}s...")
-                            await asyncio.sleep(delay)
-                            continue
-                        raise BrowserConnectionError(f"Failed to connect to Browserless.io: {e}")
+            self._browser = await self._connect_browserless()
+            self._session_created_at = time.time()
+            print(f"Connected to Browserless.io! Session timeout: {self._session_timeout_seconds}s")
         else:
-            # Fallback to local browser (slow in containers)
+            # Fallback to local browser (slow in containers). The
+            # persistent profile keeps the network caches warm across
+            # process restarts, so only the first-ever launch pays the
+            # full cold start
             print("No BROWSERLESS_TOKEN found, launching local browser...")
-            self._browser = await self._playwright.chromium.launch(
+            self._persistent_context = await self._playwright.chromium.launch_persistent_context(
+                user_data_dir=_PROFILE_DIR,
                 headless=self._headless,
                 timeout=300000,
                 args=[
                     "--disable-blink-features=AutomationControlled",
                     "--no-sandbox",
                     "--disable-dev-shm-usage",
-                ]
+                ],
+                user_agent=self._get_random_user_agent(),
+                viewport=self._get_random_viewport(),
+                locale="en-US",
+                timezone_id="America/Chicago",
+                color_scheme="light",
             )
+            await self._prepare_context(self._persistent_context)
             # Track session for local browser too (no timeout, but useful for logging)
             self._session_created_at = time.time()
             self._session_timeout_seconds = 999999  # No practical timeout for local
@@ -244,6 +398,30 @@ class AsyncStealthBrowser:
 
     async def stop(self) -> None:
         """Disconnect/close browser."""
+        if self._standby_task is not None:
+            self._standby_task.cancel()
+            self._standby_task = None
+        if self._standby is not None:
+            try:
+                await self._standby.close()
+            except Exception:
+                pass
+            self._standby = None
+
+        if self._shared_context and self._shared_context is not self._persistent_context:
+            try:
+                await self._shared_context.close()
+            except Exception:
+                pass
+        self._shared_context = None
+
+        if self._persistent_context:
+            try:
+                await self._persistent_context.close()
+            except Exception:
+                pass
+            self._persistent_context = None
+
         if self._browser:
             try:
                 await self._browser.close()
@@ -259,16 +437,53 @@ class AsyncStealthBrowser:
             self._playwright = None
 
         self._session_created_at = None
+        # Any pages still counted died with the connection
+        self._pages_in_flight = 0
         print("Browser closed")
 
-    async def _get_browser(self) -> Browser:
-        if self._browser is None:
+    async def _get_browser(self) -> Optional[Browser]:
+        if self._browser is None and self._persistent_context is None:
             await self.start()
         return self._browser
 
+    def _register_page(self, page: Page) -> None:
+        """Count a newly opened page as in flight until it closes."""
+        self._pages_in_flight += 1
+        page.once("close", self._release_page)
+
+    def _release_page(self, page: Page) -> None:
+        self._pages_in_flight = max(0, self._pages_in_flight - 1)
+
+    async def _prepare_context(self, context: BrowserContext) -> None:
+        """Apply stealth scripts and asset blocking to a context."""
+        # Track every page the context opens - including ones scrapers
+        # create directly off pooled contexts - so rotation knows when
+        # the connection is idle
+        context.on("page", self._register_page)
+        # Stealth scripts (by path when the temp file could be written,
+        # inline otherwise)
+        if _STEALTH_INIT_PATH is not None:
+            await context.add_init_script(path=str(_STEALTH_INIT_PATH))
+        else:
+            await context.add_init_script(_STEALTH_INIT_JS)
+
+        # Context-level so every page (including ones the scrapers open
+        # directly off pooled contexts) skips heavyweight resources
+        if self._block_assets:
+            await context.route(
+                "**/*",
+                lambda route: route.abort()
+                if route.request.resource_type in BLOCKED_RESOURCE_TYPES
+                else route.continue_(),
+            )
+
     async def create_context(self) -> BrowserContext:
         """Create a new browser context with stealth settings."""
         browser = await self._get_browser()
+        if browser is None:
+            # Local persistent launch: the one on-disk context *is* the
+            # browser, already stealth-prepared in start()
+            return self._persistent_context
 
         user_agent = self._get_random_user_agent()
         viewport = self._get_random_viewport()
@@ -281,14 +496,7 @@ class AsyncStealthBrowser:
             color_scheme="light",
             java_script_enabled=True,
         )
-
-        # Stealth scripts
-        await context.add_init_script("""
-            Object.defineProperty(navigator, 'webdriver', { get: () => undefined });
-            Object.defineProperty(navigator, 'plugins', { get: () => [1, 2, 3, 4, 5] });
-            Object.defineProperty(navigator, 'languages', { get: () => ['en-US', 'en'] });
-            window.chrome = { runtime: {} };
-        """)
+        await self._prepare_context(context)
 
         return context
 
@@ -298,35 +506,96 @@ class AsyncStealthBrowser:
 
         page = await context.new_page()
 
-        await page.set_extra_http_headers({
-            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-            "Accept-Language": "en-US,en;q=0.9",
-        })
+        await page.set_extra_http_headers(_EXTRA_HEADERS)
 
         return page
 
+    async def _get_shared_context(self) -> BrowserContext:
+        """Get the long-lived context, creating it on first use."""
+        if self._shared_context is None:
+            self._shared_context = await self.create_context()
+        return self._shared_context
+
+    async def rotate_identity(self) -> None:
+        """
+        Drop the shared context so the next page gets a fresh UA,
+        viewport, and cookie jar. Only needed when a site starts
+        flagging the current identity.
+        """
+        if self._persistent_context is not None:
+            # The on-disk profile *is* the identity for local launches;
+            # closing it would take the whole browser down
+            return
+        if self._shared_context is not None:
+            try:
+                await self._shared_context.close()
+            except Exception:
+                pass
+            self._shared_context = None
+
     @asynccontextmanager
-    async def get_page(self):
-        """Async context manager for getting a stealth page."""
+    async def get_page(self, reuse_context: bool = True):
+        """
+        Async context manager for getting a stealth page.
+
+        By default the page comes from a shared long-lived context (one
+        identity per browser, as Playwright recommends) so each scrape
+        only pays for a new page, not for rebuilding the context and its
+        init scripts. Pass reuse_context=False for a throwaway context.
+        """
         context = None
         page = None
         try:
-            context = await self.create_context()
-            page = await self.new_page(context)
+            if reuse_context:
+                page = await self.new_page(await self._get_shared_context())
+            else:
+                context = await self.create_context()
+                page = await self.new_page(context)
+                if context is self._persistent_context:
+                    # The profile-backed context must outlive the page
+                    context = None
             yield page
         finally:
-            if page:
+            if context:
+                # Closing the context tears down its pages too - one CDP
+                # round-trip instead of two
                 try:
-                    await page.close()
+                    await context.close()
                 except Exception:
                     pass
-            if context:
+            elif page:
+                # Shared context stays up; only this page goes away
                 try:
-                    await context.close()
+                    await page.close()
                 except Exception:
                     pass
 
 
+# Process-wide shared browser: concurrent scrapers get contexts from one
+# Chromium connection instead of each launching (or dialing) their own
+_shared_browser: Optional[AsyncStealthBrowser] = None
+_shared_browser_lock = asyncio.Lock()
+
+
+async def get_shared_browser() -> AsyncStealthBrowser:
+    """Get the shared stealth browser, starting it on first use."""
+    global _shared_browser
+    async with _shared_browser_lock:
+        if _shared_browser is None:
+            _shared_browser = AsyncStealthBrowser(headless=True)
+            await _shared_browser.start()
+        return _shared_browser
+
+
+async def close_shared_browser() -> None:
+    """Stop the shared browser (called on app shutdown)."""
+    global _shared_browser
+    async with _shared_browser_lock:
+        if _shared_browser is not None:
+            await _shared_browser.stop()
+            _shared_browser = None
+
+
 # Aliases
 StealthBrowser = AsyncStealthBrowser
 SyncStealthBrowser = AsyncStealthBrowser
@@ -15,23 +15,88 @@ from dataclasses import dataclass, field
 
 import json
 
-from bs4 import BeautifulSoup
+import httpx
+import orjson
+from bs4 import BeautifulSoup, FeatureNotFound
+
+try:
+    # C-based HTML parser, much faster than html.parser for full-page walks
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+
+from .stealth_browser import (
+    AsyncStealthBrowser,
+    BrowserSessionExpiredError,
+    USER_AGENTS,
+    get_shared_browser,
+)
+
+
+# UI chrome that leaks into candidate item names, compiled into a single
+# alternation so each name is scanned once instead of once per pattern
+UI_PATTERNS = [
+    'sign up', 'log in', 'sign in', 'view cart', 'checkout',
+    'delivery fee', 'service fee', 'get it delivered',
+    'enter your address', 'group order', 'schedule',
+]
+UI_RE = re.compile('|'.join(re.escape(p) for p in UI_PATTERNS), re.IGNORECASE)
+
+# Precompiled patterns shared across parses: compiling per call (or per
+# item, for the calorie search) is redundant work on 200-item menus
+PRICE_RE = re.compile(r'[£$](\d+(?:\.\d{2})?)')
+CAL_RE = re.compile(r'(\d+)\s*Cal')
+STORE_ITEM_RE = re.compile(r'^store-item-')
+
+# Combined alternation so one scan of an item's text yields both the
+# price (group 1) and the calorie count (group 2)
+PRICE_CAL_RE = re.compile(r'[£$](\d+(?:\.\d{2})?)|(\d+)\s*Cal')
+
+# In-page extractors: Chromium's own DOM traversal pulls out the JSON-LD
+# script bodies and compact item fields, so only a few KB cross the CDP
+# socket instead of the multi-MB serialized page that page.content()
+# would ship for re-parsing in Python
+JS_EXTRACT_JSON_LD = """
+() => Array.from(document.querySelectorAll('script[type="application/ld+json"]'))
+    .map((s) => s.textContent || '')
+"""
+JS_EXTRACT_ITEMS = """
+() => Array.from(document.querySelectorAll('[data-testid^="store-item-"]')).map((el) => ({
+    alt: el.querySelector('img')?.alt || '',
+    h3: el.querySelector('h3')?.innerText || '',
+    text: el.innerText || '',
+}))
+"""
+
 
-from .stealth_browser import AsyncStealthBrowser, BrowserSessionExpiredError
+def _price_to_cents(price_str: str) -> int:
+    """'9.99' -> 999, '9' -> 900 (the price regex allows 0 or 2 decimals)."""
+    if '.' in price_str:
+        return int(price_str.replace('.', '', 1))
+    return int(price_str) * 100
 
 
-@dataclass
+@dataclass(slots=True)
 class ScrapedMenuItem:
-    """Data class for a scraped menu item."""
+    """
+    Data class for a scraped menu item.
+
+    Prices are stored as integer cents on the hot path; Decimal objects
+    are only built at the serialization boundary via the price property.
+    """
     name: str
-    price: Decimal
+    price_cents: int = 0
     category: Optional[str] = None
     description: Optional[str] = None
     is_available: bool = True
     position: int = 0
 
+    @property
+    def price(self) -> Decimal:
+        return Decimal(self.price_cents).scaleb(-2)
+
 
-@dataclass
+@dataclass(slots=True)
 class ScrapeResult:
     """Result of a scraping operation."""
     restaurant_name: str
@@ -42,48 +107,58 @@ class ScrapeResult:
     error_message: Optional[str] = None
 
 
+def dumps_result(result: ScrapeResult) -> bytes:
+    """
+    Serialize a ScrapeResult to JSON bytes with orjson.
+
+    Dataclasses and datetimes are handled natively in Rust; integer-cent
+    prices mean no Decimal fallback encoder is needed.
+    """
+    return orjson.dumps(result)
+
+
 class UberEatsScraper:
     """
     Async Uber Eats menu scraper using Playwright with stealth measures.
     """
 
-    def __init__(self, browser=None):
-        # browser parameter kept for compatibility but ignored
-        self._browser: Optional[AsyncStealthBrowser] = None
+    def __init__(self, browser: Optional[AsyncStealthBrowser] = None):
+        # Optionally injected browser; otherwise the process-wide shared
+        # one is used so concurrent scrapers share a single Chromium
+        self._browser: Optional[AsyncStealthBrowser] = browser
 
     async def _get_browser(self) -> AsyncStealthBrowser:
-        """Get or create a browser instance."""
-        if self._browser is None:
-            self._browser = AsyncStealthBrowser(headless=True)
-            await self._browser.start()
-        return self._browser
+        """Get the injected browser or the process-wide shared one."""
+        if self._browser is not None:
+            return self._browser
+        return await get_shared_browser()
 
     async def close(self) -> None:
-        """Close the browser."""
-        if self._browser:
-            await self._browser.stop()
-            self._browser = None
+        """Release this scraper; the shared browser stays up for others."""
+        self._browser = None
 
     async def _scroll_page(self, page, max_scrolls: int = 5) -> None:
-        """Fast scroll to load lazy content. Optimized for 60s session limit."""
-        scroll_height = await page.evaluate("document.body.scrollHeight")
-
-        current_position = 0
-        scroll_count = 0
-        while current_position < scroll_height and scroll_count < max_scrolls:
-            scroll_amount = 3000  # Very big jumps for speed
-            current_position += scroll_amount
-            scroll_count += 1
-
-            await page.evaluate(f"window.scrollTo(0, {current_position})")
-            await asyncio.sleep(0.02)  # Minimal scroll delay
-
-            new_height = await page.evaluate("document.body.scrollHeight")
-            if new_height > scroll_height:
-                scroll_height = new_height
+        """
+        Fast scroll to load lazy content. Optimized for 60s session limit.
 
-        # Scroll back to top
-        await page.evaluate("window.scrollTo(0, 0)")
+        Runs the whole scroll loop in one evaluate call so each step
+        doesn't pay a CDP round-trip over the Browserless WebSocket.
+        """
+        await page.evaluate(
+            """async (maxScrolls) => {
+                const sleep = (ms) => new Promise((resolve) => setTimeout(resolve, ms));
+                let position = 0;
+                let count = 0;
+                while (position < document.body.scrollHeight && count < maxScrolls) {
+                    position += 3000;  // Very big jumps for speed
+                    count += 1;
+                    window.scrollTo(0, position);
+                    await sleep(20);
+                }
+                window.scrollTo(0, 0);
+            }""",
+            max_scrolls,
+        )
 
     async def _dismiss_cookie_banner(self, page) -> None:
         """Try to dismiss cookie consent banner if present."""
@@ -129,11 +204,48 @@ class UberEatsScraper:
         ''')
         print(f"Set delivery location: {address}")
 
+    async def _try_http(self, url: str) -> list[ScrapedMenuItem]:
+        """
+        Fetch the page with plain httpx and parse it if it came back
+        server-rendered (store-item markup or JSON-LD present). Succeeds
+        in a few hundred ms without spending any browser session time;
+        returns [] when the page needs a real browser.
+        """
+        try:
+            async with httpx.AsyncClient(
+                headers={
+                    "User-Agent": random.choice(USER_AGENTS),
+                    "Accept-Language": "en-US,en;q=0.9",
+                },
+                timeout=10.0,
+                follow_redirects=True,
+            ) as client:
+                response = await client.get(url)
+            if response.status_code != 200:
+                return []
+            body = response.text
+            if 'store-item-' not in body and 'application/ld+json' not in body:
+                return []
+            return await asyncio.to_thread(self._parse_menu_html, body)
+        except Exception as e:
+            print(f"HTTP fast path failed: {e}")
+            return []
+
     async def scrape(self, url: str) -> ScrapeResult:
         """Scrape menu items from an Uber Eats restaurant page."""
         import time
         start_time = time.time()
 
+        # HTTP-first: a server-rendered response skips Chromium entirely
+        http_items = await self._try_http(url)
+        if http_items:
+            print(f"HTTP fast path yielded {len(http_items)} items")
+            return ScrapeResult(
+                restaurant_name="Unknown",
+                platform="ubereats",
+                items=http_items,
+            )
+
         browser = await self._get_browser()
 
         # Ensure we have enough session time for a scrape (45s navigation + buffer)
@@ -147,6 +259,26 @@ class UberEatsScraper:
         )
 
         async with browser.get_page() as page:
+            # Capture the page's own menu API responses as they stream in -
+            # structured JSON from getStore/getMenuItems beats re-parsing
+            # whatever React rendered from it
+            captured_json: list = []
+
+            async def _capture_menu_response(response) -> None:
+                try:
+                    if response.request.resource_type not in ("xhr", "fetch"):
+                        return
+                    lowered = response.url.lower()
+                    if "getmenuitems" not in lowered and "getstore" not in lowered:
+                        return
+                    if "json" not in response.headers.get("content-type", ""):
+                        return
+                    captured_json.append(await response.json())
+                except Exception:
+                    pass  # capture is best-effort; parsers below still run
+
+            page.on("response", _capture_menu_response)
+
             try:
                 # Only set location via localStorage if URL doesn't have location params
                 # URLs with pl= or diningMode=DELIVERY already have location embedded
@@ -165,6 +297,18 @@ class UberEatsScraper:
                 if remaining_time < 5:
                     print(f"Session time critically low ({remaining_time:.1f}s), getting content immediately")
                 else:
+                    # Bounded wait for the first menu cards: returns the
+                    # moment content exists instead of a fixed settle.
+                    # networkidle is a poor signal here - analytics pings
+                    # keep the network busy well past menu render
+                    try:
+                        await page.wait_for_selector(
+                            '[data-testid^="store-item-"]',
+                            timeout=min(10000, int(max(remaining_time - 5, 1) * 1000)),
+                        )
+                    except Exception:
+                        print("Menu selector never appeared, continuing with page as-is")
+
                     # Dismiss cookie banner if present (skip if time is low)
                     if remaining_time > 15:
                         await self._dismiss_cookie_banner(page)
@@ -178,9 +322,6 @@ class UberEatsScraper:
                     else:
                         print(f"Skipping scroll due to low session time ({remaining_time:.1f}s)")
 
-                # Get HTML and parse - do this as quickly as possible
-                html = await page.content()
-
                 # Try to get restaurant name from h1
                 try:
                     h1 = await page.query_selector('h1')
@@ -189,7 +330,33 @@ class UberEatsScraper:
                 except Exception:
                     pass
 
-                items = self._parse_menu_html(html)
+                # Captured API JSON first, then in-page extraction:
+                # JSON-LD script bodies, then compact item fields
+                items: list[ScrapedMenuItem] = []
+                for payload in captured_json:
+                    items = self._extract_items_from_json(payload)
+                    if items:
+                        print(f"Extracted {len(items)} items from captured menu API JSON")
+                        break
+                try:
+                    if not items:
+                        for raw_ld in await page.evaluate(JS_EXTRACT_JSON_LD):
+                            items = self._items_from_json_ld_text(raw_ld)
+                            if items:
+                                print(f"Extracted {len(items)} items from JSON-LD data")
+                                break
+                    if not items:
+                        raw_items = await page.evaluate(JS_EXTRACT_ITEMS)
+                        items = self._items_from_in_page(raw_items)
+                except Exception as e:
+                    print(f"In-page extraction failed: {e}")
+
+                if not items:
+                    # Full HTML fallback with the richer parser heuristics.
+                    # Parsing is CPU-bound; run it off the event loop so
+                    # concurrent scrapes keep making progress
+                    html = await page.content()
+                    items = await asyncio.to_thread(self._parse_menu_html, html)
                 result.items = items
                 result.success = len(items) > 0
 
@@ -208,82 +375,336 @@ class UberEatsScraper:
 
         return result
 
+    async def scrape_many(self, urls: list[str], max_concurrency: int = 5) -> list[ScrapeResult]:
+        """
+        Scrape several restaurant pages concurrently against one shared
+        browser - scrapes overlap their network and render waits instead
+        of paying navigation + scroll per URL serially.
+
+        Args:
+            urls: Uber Eats restaurant URLs
+            max_concurrency: Cap on simultaneous scrapes. The Browserless
+                free tier's 60s session budget is shared, so keep modest.
+
+        Returns:
+            ScrapeResults in the same order as urls; per-URL failures come
+            back as failed results rather than raising.
+        """
+        # Pre-warm so concurrent scrapes find a started browser instead
+        # of racing to dial one each
+        await self._get_browser()
+
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def scrape_one(url: str) -> ScrapeResult:
+            async with semaphore:
+                try:
+                    return await self.scrape(url)
+                except Exception as e:
+                    return ScrapeResult(
+                        restaurant_name="Unknown",
+                        success=False,
+                        error_message=str(e),
+                    )
+
+        return list(await asyncio.gather(*[scrape_one(url) for url in urls]))
+
+    # Fields whose integer values the Uber Eats APIs quote in cents;
+    # floats and display strings always quote dollars
+    _CENT_FIELDS = frozenset({"price", "priceCents", "amount"})
+
+    @classmethod
+    def _parse_json_price(cls, raw, field: str) -> Optional[int]:
+        """
+        Parse a JSON price field into cents. Units come from the field
+        name, not the magnitude: integers in cent-denominated fields pass
+        through unchanged, everything else is treated as dollars.
+        """
+        try:
+            if isinstance(raw, bool):
+                return None
+            if isinstance(raw, int):
+                return raw if field in cls._CENT_FIELDS else raw * 100
+            if isinstance(raw, float):
+                return round(raw * 100)
+            if isinstance(raw, str):
+                match = re.search(r'(\d+(?:\.\d{2})?)', raw)
+                if match:
+                    return _price_to_cents(match.group(1))
+        except Exception:
+            return None
+        return None
+
+    def _extract_items_from_json(self, data) -> list[ScrapedMenuItem]:
+        """
+        Walk a captured menu API payload and pull out item dicts.
+
+        Any dict carrying both a name and a price key is treated as an
+        item; the nearest enclosing named node is used as its category.
+        """
+        items: list[ScrapedMenuItem] = []
+        seen_hashes: set[int] = set()
+
+        def visit(node, category: Optional[str]) -> None:
+            if isinstance(node, dict):
+                name = node.get("title") or node.get("name")
+                if isinstance(name, dict):
+                    # Uber Eats wraps display strings as {"text": ...}
+                    name = name.get("text")
+                price_field, price_raw = next(
+                    ((k, node[k]) for k in ("priceCents", "price", "amount") if k in node),
+                    (None, None),
+                )
+                if isinstance(name, str) and price_raw is not None:
+                    price_cents = self._parse_json_price(price_raw, price_field)
+                    name_hash = hash(name.lower())
+                    if (
+                        price_cents is not None
+                        and name_hash not in seen_hashes
+                        and not self._is_ui_element(name)
+                    ):
+                        description = node.get("description")
+                        if isinstance(description, dict):
+                            description = description.get("text")
+                        items.append(ScrapedMenuItem(
+                            name=name,
+                            price_cents=price_cents,
+                            category=category,
+                            description=description if isinstance(description, str) else None,
+                            position=len(items),
+                        ))
+                        seen_hashes.add(name_hash)
+                    return
+                child_category = name if isinstance(name, str) else category
+                for value in node.values():
+                    if isinstance(value, (dict, list)):
+                        visit(value, child_category)
+            elif isinstance(node, list):
+                for value in node:
+                    visit(value, category)
+
+        visit(data, None)
+        return items
+
+    def _items_from_in_page(self, raw: list[dict]) -> list[ScrapedMenuItem]:
+        """
+        Build menu items from the {alt, h3, text} records returned by the
+        in-page extractor; only the combined price/calorie regex and the
+        name filters run in Python.
+        """
+        items = []
+        position = 0
+        seen_hashes: set[int] = set()
+
+        for card in raw:
+            name = (card.get("alt") or "").strip() or (card.get("h3") or "").strip()
+            if not name or len(name) < 2:
+                continue
+            name_hash = hash(name.lower())
+            if name_hash in seen_hashes or self._is_ui_element(name):
+                continue
+
+            price_cents, description = self._price_and_calories(card.get("text") or "")
+
+            items.append(ScrapedMenuItem(
+                name=name,
+                price_cents=price_cents,
+                description=description,
+                position=position,
+            ))
+            seen_hashes.add(name_hash)
+            position += 1
+
+        return items
+
     def _parse_menu_html(self, html: str) -> list[ScrapedMenuItem]:
-        """Parse menu items from Uber Eats HTML."""
-        soup = BeautifulSoup(html, "html.parser")
+        """
+        Parse menu items from Uber Eats HTML.
+
+        Uses selectolax's C-based lexbor parser when available (the
+        pure-Python tree walk is the CPU bottleneck on big pages), with
+        BeautifulSoup as the fallback. Both paths try JSON-LD structured
+        data first, then fall back to walking the rendered menu markup.
+        """
+        if LexborHTMLParser is not None:
+            return self._parse_menu_lexbor(html)
+        return self._parse_menu_bs4(html)
+
+    def _parse_menu_lexbor(self, html: str) -> list[ScrapedMenuItem]:
+        """Parse menu items with selectolax (fast path)."""
+        tree = LexborHTMLParser(html)
+
+        for script in tree.css('script[type="application/ld+json"]'):
+            items = self._items_from_json_ld_text(script.text())
+            if items:
+                print(f"Extracted {len(items)} items from JSON-LD data")
+                return items
+
+        print("JSON-LD not found, falling back to HTML parsing")
+        return self._parse_menu_from_lexbor(tree)
+
+    def _parse_menu_bs4(self, html: str) -> list[ScrapedMenuItem]:
+        """Parse menu items with BeautifulSoup (fallback when selectolax is unavailable)."""
+        try:
+            # lxml parses multi-MB pages several times faster than the
+            # pure-Python html.parser backend
+            soup = BeautifulSoup(html, "lxml")
+        except FeatureNotFound:
+            soup = BeautifulSoup(html, "html.parser")
 
         # Try JSON-LD extraction first
-        items = self._extract_from_json_ld(soup)
-        if items:
-            print(f"Extracted {len(items)} items from JSON-LD data")
-            return items
+        for script in soup.find_all('script', type='application/ld+json'):
+            items = self._items_from_json_ld_text(script.string)
+            if items:
+                print(f"Extracted {len(items)} items from JSON-LD data")
+                return items
 
         # Fall back to HTML parsing
         print("JSON-LD not found, falling back to HTML parsing")
         return self._parse_menu_from_html(soup)
 
-    def _extract_from_json_ld(self, soup: BeautifulSoup) -> list[ScrapedMenuItem]:
-        """Extract menu items from JSON-LD structured data."""
+    def _items_from_json_ld_text(self, raw: Optional[str]) -> list[ScrapedMenuItem]:
+        """Extract menu items from one JSON-LD script body; [] if not a menu."""
         items = []
         position = 0
 
-        for script in soup.find_all('script', type='application/ld+json'):
-            try:
-                data = json.loads(script.string)
-                if not isinstance(data, dict):
-                    continue
-
-                menu = data.get('hasMenu')
-                if not menu or 'hasMenuSection' not in menu:
-                    continue
-
-                for section in menu['hasMenuSection']:
-                    category = section.get('name', 'Uncategorized')
-                    menu_items = section.get('hasMenuItem', [])
-
-                    for menu_item in menu_items:
-                        name = menu_item.get('name')
-                        if not name:
-                            continue
-
-                        price = Decimal("0.00")
-                        offers = menu_item.get('offers', {})
-                        if isinstance(offers, dict):
-                            price_str = offers.get('price', '0')
-                            try:
-                                price = Decimal(str(price_str))
-                            except:
-                                pass
-
-                        description = menu_item.get('description')
+        try:
+            data = json.loads(raw) if raw else None
+            if not isinstance(data, dict):
+                return []
+
+            menu = data.get('hasMenu')
+            if not menu or 'hasMenuSection' not in menu:
+                return []
+
+            for section in menu['hasMenuSection']:
+                category = section.get('name', 'Uncategorized')
+                menu_items = section.get('hasMenuItem', [])
+
+                for menu_item in menu_items:
+                    name = menu_item.get('name')
+                    if not name:
+                        continue
+
+                    price_cents = 0
+                    offers = menu_item.get('offers', {})
+                    if isinstance(offers, dict):
+                        price_str = offers.get('price', '0')
+                        try:
+                            price_cents = int(Decimal(str(price_str)).scaleb(2))
+                        except:
+                            pass
+
+                    description = menu_item.get('description')
+
+                    items.append(ScrapedMenuItem(
+                        name=name,
+                        price_cents=price_cents,
+                        category=category,
+                        description=description,
+                        position=position,
+                    ))
+                    position += 1
+
+        except json.JSONDecodeError:
+            return []
+        except Exception as e:
+            print(f"Error parsing JSON-LD: {e}")
+            return []
 
-                        items.append(ScrapedMenuItem(
-                            name=name,
-                            price=price,
-                            category=category,
-                            description=description,
-                            position=position,
-                        ))
-                        position += 1
+        return items
+
+    def _parse_menu_from_lexbor(self, tree) -> list[ScrapedMenuItem]:
+        """Fallback HTML parsing for menu items (selectolax tree)."""
+        items = []
+        position = 0
+        # Case-insensitive fingerprints: one int per seen name instead of
+        # holding and re-comparing the full strings
+        seen_hashes: set[int] = set()
 
-                if items:
-                    return items
+        catalog_sections = tree.css('[data-testid="store-catalog-section-vertical-grid"]')
 
-            except json.JSONDecodeError:
-                continue
-            except Exception as e:
-                print(f"Error parsing JSON-LD: {e}")
-                continue
+        for section in catalog_sections:
+            category = None
+            parent = section.parent
+            for _ in range(5):
+                if parent is None:
+                    break
+                title_node = parent.css_first('[data-testid="catalog-section-title"]')
+                if title_node:
+                    category = title_node.text(strip=True)
+                    break
+                parent = parent.parent
+
+            for node in section.css('[data-testid^="store-item-"]'):
+                item = self._extract_item_from_node(node, position, category)
+                name_hash = hash(item.name.lower()) if item else 0
+                if item and name_hash not in seen_hashes:
+                    if not self._is_ui_element(item.name):
+                        items.append(item)
+                        seen_hashes.add(name_hash)
+                        position += 1
+
+        if not items:
+            for node in tree.css('[data-testid^="store-item-"]'):
+                item = self._extract_item_from_node(node, position, None)
+                name_hash = hash(item.name.lower()) if item else 0
+                if item and name_hash not in seen_hashes:
+                    if not self._is_ui_element(item.name):
+                        items.append(item)
+                        seen_hashes.add(name_hash)
+                        position += 1
 
         return items
 
+    def _extract_item_from_node(self, node, position: int, category: Optional[str] = None) -> Optional[ScrapedMenuItem]:
+        """Extract menu item data from a selectolax node."""
+        try:
+            name = None
+
+            img = node.css_first('img')
+            if img:
+                alt = img.attributes.get('alt')
+                if alt:
+                    name = alt.strip()
+
+            if not name:
+                h3 = node.css_first('h3')
+                if h3:
+                    name = h3.text(strip=True)
+
+            if not name:
+                for span in node.css('span'):
+                    text = span.text(strip=True)
+                    if text and 3 < len(text) < 80 and not text.startswith(('£', '$', '#')):
+                        name = text
+                        break
+
+            if not name or len(name) < 2:
+                return None
+
+            text_content = node.text(separator=' ')
+            price_cents, description = self._price_and_calories(text_content)
+
+            return ScrapedMenuItem(
+                name=name,
+                price_cents=price_cents,
+                category=category,
+                description=description,
+                position=position,
+            )
+
+        except Exception as e:
+            print(f"Error extracting item: {e}")
+            return None
+
     def _parse_menu_from_html(self, soup: BeautifulSoup) -> list[ScrapedMenuItem]:
         """Fallback HTML parsing for menu items."""
         items = []
         position = 0
-        seen_names = set()
-
-        price_pattern = re.compile(r'[£$](\d+(?:\.\d{2})?)')
+        # Case-insensitive fingerprints: one int per seen name instead of
+        # holding and re-comparing the full strings
+        seen_hashes: set[int] = set()
 
         catalog_sections = soup.find_all(attrs={'data-testid': 'store-catalog-section-vertical-grid'})
 
@@ -299,49 +720,58 @@ class UberEatsScraper:
                     break
                 parent = parent.parent
 
-            store_items = section.find_all(attrs={'data-testid': re.compile(r'^store-item-')})
+            store_items = section.find_all(attrs={'data-testid': STORE_ITEM_RE})
 
             for element in store_items:
-                item = self._extract_item_from_element(element, position, price_pattern, category)
-                if item and item.name not in seen_names:
+                item = self._extract_item_from_element(element, position, category)
+                name_hash = hash(item.name.lower()) if item else 0
+                if item and name_hash not in seen_hashes:
                     if not self._is_ui_element(item.name):
                         items.append(item)
-                        seen_names.add(item.name)
+                        seen_hashes.add(name_hash)
                         position += 1
 
         if not items:
-            store_items = soup.find_all(attrs={'data-testid': re.compile(r'^store-item-')})
+            store_items = soup.find_all(attrs={'data-testid': STORE_ITEM_RE})
             for element in store_items:
-                item = self._extract_item_from_element(element, position, price_pattern, None)
-                if item and item.name not in seen_names:
+                item = self._extract_item_from_element(element, position, None)
+                name_hash = hash(item.name.lower()) if item else 0
+                if item and name_hash not in seen_hashes:
                     if not self._is_ui_element(item.name):
                         items.append(item)
-                        seen_names.add(item.name)
+                        seen_hashes.add(name_hash)
                         position += 1
 
         return items
 
     def _is_ui_element(self, name: str) -> bool:
         """Check if name looks like a UI element rather than menu item."""
-        ui_patterns = [
-            'sign up', 'log in', 'sign in', 'view cart', 'checkout',
-            'delivery fee', 'service fee', 'get it delivered',
-            'enter your address', 'group order', 'schedule',
-        ]
-        name_lower = name.lower().strip()
-
-        if len(name_lower) < 3:
-            return True
-
-        for pattern in ui_patterns:
-            if pattern in name_lower:
-                return True
-
-        return False
-
-    def _extract_item_from_element(self, element, position: int, price_pattern, category: Optional[str] = None) -> Optional[ScrapedMenuItem]:
+        name = name.strip()
+        return len(name) < 3 or UI_RE.search(name) is not None
+
+    @staticmethod
+    def _price_and_calories(text_content: str) -> tuple[int, Optional[str]]:
+        """Pull price cents and a calorie description from one text scan."""
+        price_cents = 0
+        description = None
+        for match in PRICE_CAL_RE.finditer(text_content):
+            if match.group(1) is not None:
+                if price_cents == 0:
+                    price_cents = _price_to_cents(match.group(1))
+            elif description is None:
+                description = f"{match.group(2)} calories"
+            if price_cents and description:
+                break
+        return price_cents, description
+
+    def _extract_item_from_element(self, element, position: int, category: Optional[str] = None) -> Optional[ScrapedMenuItem]:
         """Extract menu item data from a BeautifulSoup element."""
         try:
+            # One subtree walk builds the text buffer; price and calories
+            # both come out of it in a single combined-regex scan
+            text_content = element.get_text(" ", strip=True)
+            price_cents, description = self._price_and_calories(text_content)
+
             name = None
 
             img = element.find('img')
@@ -354,8 +784,9 @@ class UberEatsScraper:
                     name = h3.get_text(strip=True)
 
             if not name:
-                for span in element.find_all('span'):
-                    text = span.get_text(strip=True)
+                # .string avoids a recursive get_text walk per span
+                for span in element.find_all('span')[:5]:
+                    text = (span.string or '').strip()
                     if text and 3 < len(text) < 80 and not text.startswith(('£', '$', '#')):
                         name = text
                         break
@@ -363,20 +794,9 @@ class UberEatsScraper:
             if not name or len(name) < 2:
                 return None
 
-            price = Decimal("0.00")
-            text_content = element.get_text()
-            price_match = price_pattern.search(text_content)
-            if price_match:
-                price = Decimal(price_match.group(1))
-
-            description = None
-            cal_match = re.search(r'(\d+)\s*Cal', text_content)
-            if cal_match:
-                description = f"{cal_match.group(1)} calories"
-
             return ScrapedMenuItem(
                 name=name,
-                price=price,
+                price_cents=price_cents,
                 category=category,
                 description=description,
                 position=position,
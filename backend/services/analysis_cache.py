@@ -0,0 +1,53 @@
+"""
+In-process cache for price analysis responses.
+
+Menu data only changes when a scrape lands, so repeated /price-analysis
+(and /roi-analysis) requests between scrapes can be served from memory.
+Entries are keyed on tenant, threshold, and the latest scrape timestamp;
+scrape paths call bump() to drop stale entries as soon as new data commits.
+"""
+
+import asyncio
+import time
+from typing import Any, Optional
+
+
+class PriceAnalysisCache:
+    """
+    Small TTL cache with explicit invalidation.
+
+    Safe for single-process deployments (matches the in-memory
+    ScrapeStatusTracker); entries expire after ttl_seconds even
+    without an explicit bump.
+    """
+
+    def __init__(self, ttl_seconds: float = 60.0):
+        self._ttl = ttl_seconds
+        self._entries: dict[tuple, tuple[float, Any]] = {}
+        self._lock = asyncio.Lock()
+
+    async def get(self, key: tuple) -> Optional[Any]:
+        """Return the cached value for key, or None if missing/expired."""
+        async with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            cached_at, value = entry
+            if time.monotonic() - cached_at > self._ttl:
+                del self._entries[key]
+                return None
+            return value
+
+    async def set(self, key: tuple, value: Any) -> None:
+        """Store a value for key, treated as immutable by callers."""
+        async with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+
+    async def bump(self) -> None:
+        """Drop all cached analyses after fresh scrape data is committed."""
+        async with self._lock:
+            self._entries.clear()
+
+
+# Global cache instance
+price_analysis_cache = PriceAnalysisCache()
@@ -0,0 +1,361 @@
+"""
+Competitor menu scraper service.
+
+Handles background scraping of competitor menus so HTTP handlers can
+return immediately with a job id instead of holding a worker and a DB
+session for the duration of a live scrape.
+"""
+
+import asyncio
+import logging
+from datetime import datetime, timezone
+
+from sqlalchemy import select, delete, insert, or_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from database import async_session
+from models import Competitor, MenuItem, PriceHistory
+from scraper.doordash_scraper import DoorDashScraper
+from scraper.stealth_browser import close_shared_browser
+from scraper.ubereats_scraper import UberEatsScraper
+from services.analysis_cache import price_analysis_cache
+from services.category_ai import category_ai_service
+from services.scrape_status import scrape_tracker, ScrapeState
+
+logger = logging.getLogger(__name__)
+
+# Shared scraper instances, created lazily and reused across scrapes so
+# each request doesn't build and tear down a fresh browser client
+_ubereats_scraper: UberEatsScraper | None = None
+_doordash_scraper: DoorDashScraper | None = None
+
+
+def _get_ubereats_scraper() -> UberEatsScraper:
+    global _ubereats_scraper
+    if _ubereats_scraper is None:
+        _ubereats_scraper = UberEatsScraper()
+    return _ubereats_scraper
+
+
+def _get_doordash_scraper() -> DoorDashScraper:
+    global _doordash_scraper
+    if _doordash_scraper is None:
+        _doordash_scraper = DoorDashScraper()
+    return _doordash_scraper
+
+
+async def close_scrapers() -> None:
+    """Close the shared scraper instances (called on app shutdown)."""
+    global _ubereats_scraper, _doordash_scraper
+    for scraper in (_ubereats_scraper, _doordash_scraper):
+        if scraper is not None:
+            try:
+                await scraper.close()
+            except Exception:
+                pass
+    _ubereats_scraper = None
+    _doordash_scraper = None
+    # The scrapers only release references; pooled contexts and the
+    # shared Chromium connection are torn down here
+    try:
+        await DoorDashScraper.close_contexts()
+    except Exception:
+        pass
+    try:
+        await close_shared_browser()
+    except Exception:
+        pass
+
+
+async def warmup_login() -> None:
+    """
+    Pre-run the DoorDash login flow so the first scrape finds a ready
+    session instead of paying the full login latency. Run as a background
+    task during app boot; a no-op when credentials aren't configured.
+    """
+    try:
+        await _get_doordash_scraper().login()
+    except Exception as e:
+        logger.warning("DoorDash login warm-up failed (non-fatal): %s", e)
+
+
+def _items_to_rows(items) -> list[dict]:
+    """Convert ScrapedMenuItem objects to plain row dicts."""
+    return [
+        {
+            "name": item.name,
+            "category": item.category,
+            "description": item.description,
+            "price": item.price,
+            "position": item.position,
+        }
+        for item in items
+    ]
+
+
+async def _scrape_ubereats(url: str) -> list[dict]:
+    """Scrape an Uber Eats menu; returns [] if nothing was found."""
+    result = await _get_ubereats_scraper().scrape(url)
+    if result.success and result.items:
+        return _items_to_rows(result.items)
+    return []
+
+
+async def _scrape_doordash(url: str) -> list[dict]:
+    """Scrape a DoorDash menu; returns [] if nothing was found."""
+    result = await _get_doordash_scraper().scrape(url)
+    if result.success and result.items:
+        return _items_to_rows(result.items)
+    return []
+
+
+async def _scrape_platforms(competitor: Competitor) -> tuple[list[dict], str | None]:
+    """
+    Scrape whichever platform URLs the competitor has, concurrently.
+
+    Both scrapers run at once instead of awaiting Uber Eats before falling
+    back to DoorDash; Uber Eats is still preferred when both succeed.
+    Returns (items_data, scrape_source); items_data is empty on failure.
+    """
+    attempts: list[tuple[str, object]] = []
+    if competitor.ubereats_url:
+        logger.info("Scraping Uber Eats for %s...", competitor.name)
+        attempts.append(("ubereats", _scrape_ubereats(competitor.ubereats_url)))
+    if competitor.doordash_url:
+        logger.info("Scraping DoorDash for %s...", competitor.name)
+        attempts.append(("doordash", _scrape_doordash(competitor.doordash_url)))
+
+    if not attempts:
+        return [], None
+
+    results = await asyncio.gather(
+        *(coro for _, coro in attempts), return_exceptions=True
+    )
+
+    # Prefer results in attempt order (Uber Eats first)
+    for (source, _), result in zip(attempts, results):
+        if isinstance(result, BaseException):
+            logger.warning("%s scraper error for %s: %s", source, competitor.name, result)
+        elif result:
+            logger.info("Successfully scraped %d items from %s", len(result), source)
+            return result, source
+
+    return [], None
+
+
+async def _auto_map_categories_task(
+    competitor_id: str,
+    competitor_name: str,
+    raw_categories: list[str],
+    tenant_id: str,
+) -> None:
+    """Auto-map raw categories in the background with its own session."""
+    try:
+        async with async_session() as db:
+            unmapped = await category_ai_service.get_unmapped_categories(
+                db, "competitor", competitor_id, raw_categories, tenant_id
+            )
+            if unmapped:
+                mapped = await category_ai_service.auto_map_categories(
+                    db, "competitor", competitor_id, unmapped, threshold=0.35, tenant_id=tenant_id
+                )
+                logger.info("Auto-mapped %d categories for competitor %s", len(mapped), competitor_name)
+    except Exception as e:
+        logger.warning("Category auto-mapping error (non-fatal): %s", e)
+
+
+async def save_scraped_menu(
+    db,
+    competitor: Competitor,
+    items_data: list[dict],
+    scrape_source: str,
+    tenant_id: str,
+) -> None:
+    """
+    Upsert a competitor's freshly scraped menu and record history.
+
+    Items are upserted on (competitor_id, platform, name) instead of
+    deleted and reinserted, and price history is only written for new
+    items or changed prices — most items are unchanged between scrapes.
+    Commits the session and invalidates cached analyses; AI category
+    mapping is kicked off as a separate task so the scrape job doesn't
+    wait on it.
+    """
+    # Existing prices keyed by (platform, name) so we can tell what changed
+    existing_result = await db.execute(
+        select(MenuItem.platform, MenuItem.name, MenuItem.current_price)
+        .where(MenuItem.competitor_id == competitor.id)
+    )
+    old_prices = {(platform, name): price for platform, name, price in existing_result}
+
+    recorded_at = datetime.now(timezone.utc)
+
+    # Build upsert rows, deduplicating names within the scrape so a single
+    # statement never hits the same unique key twice
+    menu_rows = []
+    seen_names = set()
+    categories: set[str] = set()
+    for item_data in items_data:
+        name = item_data["name"]
+        if name in seen_names:
+            continue
+        seen_names.add(name)
+        category = item_data.get("category")
+        if category:
+            categories.add(category)
+        menu_rows.append({
+            "competitor_id": competitor.id,
+            "platform": scrape_source,
+            "name": name,
+            "category": category,
+            "description": item_data.get("description"),
+            "current_price": item_data["price"],
+            "is_available": True,
+            "menu_position": item_data.get("position"),
+        })
+
+    # SQLite (local dev) and PostgreSQL (production) both support
+    # ON CONFLICT DO UPDATE through their dialect-specific insert
+    dialect_insert = (
+        pg_insert if db.get_bind().dialect.name == "postgresql" else sqlite_insert
+    )
+    stmt = dialect_insert(MenuItem).values(menu_rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["competitor_id", "platform", "name"],
+        set_={
+            "category": stmt.excluded.category,
+            "description": stmt.excluded.description,
+            "current_price": stmt.excluded.current_price,
+            "is_available": True,
+            "menu_position": stmt.excluded.menu_position,
+            "updated_at": recorded_at,
+        },
+    ).returning(MenuItem.id, MenuItem.name, MenuItem.current_price)
+    upserted = (await db.execute(stmt)).all()
+
+    # Record history only where the price actually moved (or item is new)
+    history_rows = [
+        {"menu_item_id": item_id, "price": price, "recorded_at": recorded_at}
+        for item_id, name, price in upserted
+        if old_prices.get((scrape_source, name)) != price
+    ]
+    if history_rows:
+        # PriceHistory is append-only: execute on the Core connection to
+        # skip ORM autoflush and identity-map bookkeeping per row
+        conn = await db.connection()
+        await conn.execute(insert(PriceHistory), history_rows)
+
+    # Drop items that disappeared from the menu (or came from an older
+    # scrape of a different platform); history cascades with them
+    await db.execute(
+        delete(MenuItem).where(
+            MenuItem.competitor_id == competitor.id,
+            or_(
+                MenuItem.platform != scrape_source,
+                MenuItem.name.notin_(seen_names),
+            ),
+        )
+    )
+
+    # Update competitor's last_scraped_at
+    # Same timestamp as the history rows, so recorded_at == last_scraped_at
+    competitor.last_scraped_at = recorded_at
+
+    await db.commit()
+
+    # Fresh menu data invalidates cached price analyses
+    await price_analysis_cache.bump()
+
+    # Auto-map categories off the critical path: the scrape job can report
+    # success without waiting on AI calls
+    if categories:
+        asyncio.create_task(_auto_map_categories_task(
+            competitor.id, competitor.name, list(categories), tenant_id
+        ))
+
+
+async def scrape_competitor_menu_task(
+    competitor_id: str,
+    job_id: str,
+    tenant_id: str = "default",
+) -> None:
+    """
+    Background task to scrape a competitor's menu and persist the results.
+
+    Status is reported through the shared scrape tracker so clients can
+    poll /scraping/jobs/{job_id}.
+    """
+    await scrape_tracker.update_state(job_id, ScrapeState.RUNNING)
+
+    try:
+        async with async_session() as db:
+            stmt = select(Competitor).where(
+                Competitor.id == competitor_id,
+                Competitor.tenant_id == tenant_id,
+            )
+            result = await db.execute(stmt)
+            competitor = result.scalar_one_or_none()
+
+            if not competitor:
+                await scrape_tracker.update_state(
+                    job_id,
+                    ScrapeState.FAILED,
+                    error_message=f"Competitor with id {competitor_id} not found",
+                )
+                return
+
+            items_data, scrape_source = await _scrape_platforms(competitor)
+
+            if not items_data:
+                await scrape_tracker.update_state(
+                    job_id,
+                    ScrapeState.FAILED,
+                    error_message=f"Could not scrape menu for {competitor.name}. Please check the URLs are valid.",
+                )
+                return
+
+            await save_scraped_menu(db, competitor, items_data, scrape_source, tenant_id)
+
+        await scrape_tracker.update_state(
+            job_id,
+            ScrapeState.SUCCESS,
+            items_scraped=len(items_data),
+        )
+
+    except Exception as e:
+        logger.error("Error scraping competitor menu: %s", e)
+        await scrape_tracker.update_state(
+            job_id,
+            ScrapeState.FAILED,
+            error_message=f"Scraping failed: {str(e)[:100]}",
+        )
+
+
+async def scrape_all_competitors_task(
+    jobs: list[tuple[str, str]],
+    tenant_id: str = "default",
+    max_concurrency: int = 8,
+) -> None:
+    """
+    Scrape many competitors concurrently with bounded concurrency.
+
+    Args:
+        jobs: (competitor_id, job_id) pairs, one tracked job per competitor
+        tenant_id: Tenant identifier for multi-tenant support
+        max_concurrency: Cap on simultaneous scrapes to avoid overwhelming
+            the browser service
+
+    Each scrape opens its own session, so there is no contention on a
+    shared one; failures are isolated per job via the tracker.
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def scrape_one(competitor_id: str, job_id: str) -> None:
+        async with semaphore:
+            await scrape_competitor_menu_task(competitor_id, job_id, tenant_id)
+
+    await asyncio.gather(
+        *[scrape_one(competitor_id, job_id) for competitor_id, job_id in jobs],
+        return_exceptions=True,
+    )
@@ -14,6 +14,7 @@ from database import async_session
 from models import OperatorProfile, OperatorMenuItem
 from scraper.ubereats_scraper import UberEatsScraper
 from scraper.stealth_browser import BrowserlessRateLimitError, BrowserConnectionError, BrowserSessionExpiredError
+from services.analysis_cache import price_analysis_cache
 from services.scrape_status import scrape_tracker, ScrapeState
 from services.category_ai import category_ai_service
 
@@ -130,6 +131,9 @@ async def scrape_operator_menu_task(
             await session.commit()
             print(f"Saved {len(result.items)} operator menu items to database")
 
+            # Fresh menu data invalidates cached price analyses
+            await price_analysis_cache.bump()
+
             # Auto-map categories for the operator
             try:
                 raw_categories = list(set(
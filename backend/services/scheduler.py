@@ -4,24 +4,30 @@ Scheduled scraping service using APScheduler.
 Handles automated daily scrapes of competitor menus at 6am local time.
 """
 
+import asyncio
 import logging
+import os
 from datetime import datetime, timezone
 from decimal import Decimal
 import random
 
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
-from sqlalchemy import select, delete
+from sqlalchemy import select, delete, insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from database import async_session
 from models import Competitor, MenuItem, PriceHistory, Alert
+from services.analysis_cache import price_analysis_cache
 from services.category_ai import category_ai_service
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Cap on simultaneous competitor scrapes during a scheduled run
+SCRAPE_CONCURRENCY = int(os.getenv("SCHEDULED_SCRAPE_CONCURRENCY", "10"))
+
 # Global scheduler instance
 scheduler: AsyncIOScheduler | None = None
 
@@ -146,51 +152,57 @@ async def scrape_competitor(db: AsyncSession, competitor: Competitor) -> dict:
         items_data = generate_mock_items()
         scrape_source = "mock"
 
-    # Get existing items for price change detection
-    existing_stmt = select(MenuItem).where(MenuItem.competitor_id == competitor.id)
+    # Get existing prices for change detection
+    existing_stmt = select(MenuItem.name, MenuItem.current_price).where(
+        MenuItem.competitor_id == competitor.id
+    )
     existing_result = await db.execute(existing_stmt)
-    existing_items = {item.name: item for item in existing_result.scalars().all()}
+    existing_prices = {name: price for name, price in existing_result}
 
     # Clear existing menu items
     await db.execute(
         delete(MenuItem).where(MenuItem.competitor_id == competitor.id)
     )
 
-    # Save new menu items and detect price changes
-    new_items = []
+    # Save new menu items with a single bulk INSERT instead of per-row adds
+    platform = "doordash" if scrape_source == "doordash" else "mock"
+    menu_rows = [
+        {
+            "competitor_id": competitor.id,
+            "platform": platform,
+            "name": item_data["name"],
+            "category": item_data.get("category"),
+            "description": item_data.get("description"),
+            "current_price": item_data["price"],
+            "is_available": True,
+            "menu_position": item_data.get("position"),
+        }
+        for item_data in items_data
+    ]
+    insert_result = await db.execute(
+        insert(MenuItem).returning(MenuItem.id, sort_by_parameter_order=True),
+        menu_rows,
+    )
+    menu_item_ids = insert_result.scalars().all()
+
+    # Record price history in one more bulk INSERT; alerts stay per-row
+    # since significant price changes are rare
+    recorded_at = datetime.now(timezone.utc)
+    history_rows = []
     alerts_created = 0
 
-    for item_data in items_data:
-        menu_item = MenuItem(
-            competitor_id=competitor.id,
-            platform="doordash" if scrape_source == "doordash" else "mock",
-            name=item_data["name"],
-            category=item_data.get("category"),
-            description=item_data.get("description"),
-            current_price=item_data["price"],
-            is_available=True,
-            menu_position=item_data.get("position"),
-        )
-        db.add(menu_item)
-        new_items.append(menu_item)
-
-    await db.flush()
-
-    # Record price history and create alerts for significant changes
-    for menu_item in new_items:
-        # Record price history
-        price_record = PriceHistory(
-            menu_item_id=menu_item.id,
-            price=menu_item.current_price,
-            recorded_at=datetime.now(timezone.utc),
-        )
-        db.add(price_record)
+    for item_id, row in zip(menu_item_ids, menu_rows):
+        history_rows.append({
+            "menu_item_id": item_id,
+            "price": row["current_price"],
+            "recorded_at": recorded_at,
+        })
 
         # Check for price changes (>5% threshold)
-        if menu_item.name in existing_items:
-            old_item = existing_items[menu_item.name]
-            old_price = float(old_item.current_price)
-            new_price = float(menu_item.current_price)
+        old_price_raw = existing_prices.get(row["name"])
+        if old_price_raw is not None:
+            old_price = float(old_price_raw)
+            new_price = float(row["current_price"])
 
             if old_price > 0:
                 change_pct = ((new_price - old_price) / old_price) * 100
@@ -198,7 +210,7 @@ async def scrape_competitor(db: AsyncSession, competitor: Competitor) -> dict:
                 if abs(change_pct) >= 5:
                     alert_type = "price_increase" if change_pct > 0 else "price_decrease"
                     alert = Alert(
-                        menu_item_id=menu_item.id,
+                        menu_item_id=item_id,
                         alert_type=alert_type,
                         old_value=f"${old_price:.2f}",
                         new_value=f"${new_price:.2f}",
@@ -208,8 +220,14 @@ async def scrape_competitor(db: AsyncSession, competitor: Competitor) -> dict:
                     db.add(alert)
                     alerts_created += 1
 
+    # PriceHistory is append-only: execute on the Core connection to skip
+    # ORM autoflush and identity-map bookkeeping per row
+    conn = await db.connection()
+    await conn.execute(insert(PriceHistory), history_rows)
+
     # Update competitor's last_scraped_at
-    competitor.last_scraped_at = datetime.now(timezone.utc)
+    # Same timestamp as the history rows, so recorded_at == last_scraped_at
+    competitor.last_scraped_at = recorded_at
 
     # Auto-map categories for the competitor
     categories_mapped = 0
@@ -233,7 +251,7 @@ async def scrape_competitor(db: AsyncSession, competitor: Competitor) -> dict:
 
     return {
         "success": True,
-        "items_count": len(new_items),
+        "items_count": len(menu_rows),
         "alerts_created": alerts_created,
         "categories_mapped": categories_mapped,
         "source": scrape_source,
@@ -258,33 +276,51 @@ async def run_scheduled_scrape():
 
     try:
         async with async_session() as db:
-            # Get all active competitors
-            stmt = select(Competitor).where(Competitor.scraping_enabled == True)  # noqa: E712
+            # Get all active competitor ids; each scrape opens its own session
+            stmt = select(Competitor.id).where(Competitor.scraping_enabled == True)  # noqa: E712
             result = await db.execute(stmt)
-            competitors = result.scalars().all()
-
-            logger.info(f"Found {len(competitors)} active competitors to scrape")
-
-            for competitor in competitors:
-                try:
-                    logger.info(f"Scraping {competitor.name}...")
-                    scrape_result = await scrape_competitor(db, competitor)
-
-                    total_items += scrape_result["items_count"]
-                    total_alerts += scrape_result["alerts_created"]
-                    competitors_processed += 1
-
-                    logger.info(
-                        f"  - {competitor.name}: {scrape_result['items_count']} items, "
-                        f"{scrape_result['alerts_created']} alerts ({scrape_result['source']})"
-                    )
+            competitor_ids = result.scalars().all()
+
+        logger.info(f"Found {len(competitor_ids)} active competitors to scrape")
+
+        semaphore = asyncio.Semaphore(SCRAPE_CONCURRENCY)
+
+        async def scrape_one(competitor_id: str) -> dict | None:
+            async with semaphore:
+                async with async_session() as db:
+                    competitor = await db.get(Competitor, competitor_id)
+                    if competitor is None:
+                        return None
+                    name = competitor.name
+                    try:
+                        logger.info(f"Scraping {name}...")
+                        scrape_result = await scrape_competitor(db, competitor)
+                        await db.commit()
+
+                        logger.info(
+                            f"  - {name}: {scrape_result['items_count']} items, "
+                            f"{scrape_result['alerts_created']} alerts ({scrape_result['source']})"
+                        )
+                        return scrape_result
+                    except Exception as e:
+                        error_msg = f"Error scraping {name}: {str(e)}"
+                        logger.error(error_msg)
+                        errors.append(error_msg)
+                        return None
+
+        # Fan out with bounded concurrency instead of scraping sequentially
+        scrape_results = await asyncio.gather(
+            *(scrape_one(competitor_id) for competitor_id in competitor_ids)
+        )
 
-                except Exception as e:
-                    error_msg = f"Error scraping {competitor.name}: {str(e)}"
-                    logger.error(error_msg)
-                    errors.append(error_msg)
+        for scrape_result in scrape_results:
+            if scrape_result is not None:
+                total_items += scrape_result["items_count"]
+                total_alerts += scrape_result["alerts_created"]
+                competitors_processed += 1
 
-            await db.commit()
+        # Fresh menu data invalidates cached price analyses
+        await price_analysis_cache.bump()
 
         scheduler_status["last_run_result"] = {
             "success": True,